@@ -9,6 +9,11 @@ Bu modül, Claude benzeri bir deneyim için Rich tabanlı bir REPL sunar.
 Komutlar:
     :quit / :q / exit  → oturumu sonlandırır
     :help              → komut listesini gösterir
+    :clear             → oturum belleğini temizler
+
+Önceki turların isteği ve kodu oturum belleğinde tutulur (son turlar aynen,
+eskileri özet olarak); "bunu async yap" gibi devam istekleri bu bağlamla
+çalışır.
 
 Prompt girildiğinde plan/todo seçenekleri sorulur ve CrewRunner çalıştırılır.
 """
@@ -28,8 +33,11 @@ from typing import Tuple
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 
+from deepseek_cli import config
 from deepseek_cli.crew_runner import CrewRunner
+from deepseek_cli.tools.checkpoint import RunStore
 from deepseek_cli.tools.file_tools import write_text_to_file
+from deepseek_cli.tools.session_memory import SessionMemory
 
 console = Console()
 
@@ -63,7 +71,7 @@ def print_banner() -> None:
 def print_tips() -> None:
     console.print("[bold cyan]DeepSeek CLI – Claude Code & Gemini CLI benzeri deneyim[/bold cyan]")
     console.print("[bold]Akış:[/bold] özellik seç → istek yaz → (plan? y/n) → kod & TODO → kaydet? [y/n/a]")
-    console.print("[bold]Komutlar:[/bold] :help  :quit / :q  exit  :features")
+    console.print("[bold]Komutlar:[/bold] :help  :quit / :q  exit  :features  :clear")
 
 
 CONFIG_PATH = Path.home() / ".deepseek_cli_config.json"
@@ -123,6 +131,8 @@ def main_loop() -> None:
 
     ensure_api_key()
 
+    memory = SessionMemory(budget=config.DEEPSEEK_SESSION_TOKENS)
+
     console.print("[bold green]Komutlar:[/bold green] :help  :quit / :q  exit")
 
     while True:
@@ -142,18 +152,39 @@ def main_loop() -> None:
 Commands:
   :help         → show this help message
   :features     → list available features
+  :clear        → forget earlier turns (session memory)
   :quit / :q    → exit the session
   exit          → exit the session
 """)
             continue
+        if stripped == ":clear":
+            memory.clear()
+            console.print("[green]Oturum belleği temizlendi.")
+            continue
         if stripped == ":features":
             console.print("Mevcut özellikler: kod üretimi, plan, review, fix, dosya kaydetme.")
             continue
 
         plan = Confirm.ask("Generate plan output?", default=False)
 
-        runner = CrewRunner(prompt=user_input, save_path=None, plan=plan)
+        context = memory.context()
+        run_store = None
+        if config.DEEPSEEK_REPL_CHECKPOINTS:
+            # opt-in: every turn would otherwise leave a run dir in the user's project;
+            # checkpoint'ler `deepseek_cli.cli --resume RUN_ID` ile sürdürülebilir
+            run_store = RunStore.create(user_input, meta={"prompt": user_input, "plan": plan, "context": context})
+        runner = CrewRunner(
+            prompt=user_input,
+            save_path=None,
+            plan=plan,
+            run_store=run_store,
+            context=context,
+        )
         code, suggested_path = runner.run()
+        if run_store is not None:
+            # same as the CLI: only failed or killed turns keep their checkpoints
+            run_store.remove()
+        memory.add(user_input, CrewRunner._strip(code))
 
         interactive_save(code, suggested_path, cfg)
 
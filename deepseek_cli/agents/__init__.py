@@ -3,6 +3,6 @@
 from .planner_agent import PlannerAgent  # noqa: F401
 from .todo_agent import TodoAgent  # noqa: F401
 from .coder_agent import CoderAgent  # noqa: F401
-from .reviewer_agent import ReviewerAgent  # noqa: F401
+from .reviewer_agent import ReviewerAgent, FocusedReviewerAgent  # noqa: F401
 from .fixer_agent import FixerAgent  # noqa: F401 
 from .test_agent import TestAgent  # noqa: F401 
\ No newline at end of file
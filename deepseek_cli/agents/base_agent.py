@@ -2,22 +2,31 @@ from __future__ import annotations
 
 import abc
 import importlib
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 import openai
 from deepseek_cli import config
+from deepseek_cli.tools.cassette import Cassette, request_key
+from deepseek_cli.tools.endpoints import Endpoint, EndpointPool
+from deepseek_cli.tools.stage_stats import StageStats
+from deepseek_cli.tools.minify import STAGE_POLICIES, LineMap, minify
+from deepseek_cli.tools.token_budget import Section, TokenBudget, estimate_messages, estimate_tokens
 
 # ---------------------------------------------------------------------------
 # OpenAI client setup compatible with both <1.0 and >=1.0 versions
 # ---------------------------------------------------------------------------
 
 _HAS_NEW_CLIENT = False
+_pool: Optional[EndpointPool] = None
 
 try:
     # openai >=1.0 provides OpenAI class
     from openai import OpenAI  # type: ignore
 
-    _client = OpenAI(api_key=config.DEEPSEEK_API_KEY, base_url=config.DEEPSEEK_API_BASE)
     _HAS_NEW_CLIENT = True
 except ImportError:  # pragma: no cover
     # older version fallback will use module-level api
@@ -29,6 +38,62 @@ if not _HAS_NEW_CLIENT:
     openai.api_base = config.DEEPSEEK_API_BASE
 
 
+def _error_types(module: Any, names: Tuple[str, ...]) -> Tuple[type, ...]:
+    return tuple(getattr(module, name) for name in names if hasattr(module, name))
+
+
+# errors after which another endpoint is worth trying (4xx would fail everywhere);
+# openai<1.0 keeps its exceptions in openai.error
+_FAILOVER_ERRORS = _error_types(openai, ("APIConnectionError", "InternalServerError", "RateLimitError")) + _error_types(
+    getattr(openai, "error", None), ("APIConnectionError", "ServiceUnavailableError", "RateLimitError", "Timeout")
+)
+
+# hedging needs some latency history before the p95 means anything
+_HEDGE_MIN_SAMPLES = 5
+_HEDGE_MIN_DELAY = 0.5
+
+
+class _AttemptCancelled(Exception):
+    """An attempt stopped by a winning hedge or a cancelled run; carries the tokens it produced."""
+
+    def __init__(self, tokens: int) -> None:
+        super().__init__("hedged attempt cancelled")
+        self.tokens = tokens
+
+
+def get_endpoint_pool() -> EndpointPool:
+    """Build the endpoint pool on first use so replay runs need no API key."""
+    global _pool
+    if _pool is None:
+        keys = config.DEEPSEEK_API_KEYS or [config.DEEPSEEK_API_KEY]
+        _pool = EndpointPool.from_lists(config.DEEPSEEK_API_BASES, keys)
+    return _pool
+
+
+def endpoint_report() -> Optional[Dict[str, Any]]:
+    """Failover/hedging counters, or None if no request was sent yet."""
+    return _pool.report() if _pool is not None else None
+
+
+def _client_for(endpoint: Endpoint):
+    if endpoint.client is None:
+        # the SDK's own retries would run before any failover to the next endpoint
+        endpoint.client = OpenAI(api_key=endpoint.api_key, base_url=endpoint.base_url, max_retries=0)
+    return endpoint.client
+
+
+def _charge_loser(pool: EndpointPool, prompt_tokens: int, future) -> None:
+    """Add what a cancelled hedge cost: its prompt plus any output it produced."""
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is None:
+        content, tokens, _ = future.result()
+        pool.add_extra_tokens(prompt_tokens + (tokens if tokens is not None else estimate_tokens(content)))
+    elif isinstance(exc, _AttemptCancelled):
+        pool.add_extra_tokens(prompt_tokens + exc.tokens)
+
+
 class BaseAgent(abc.ABC):
     """Abstract base class for all agents in the system."""
 
@@ -36,37 +101,262 @@ class BaseAgent(abc.ABC):
     goal: str
     backstory: str
 
+    # stage name used for history lookups and per-agent token limits
+    name: str = "agent"
+    max_input_tokens: int = 24000
+    max_output_tokens: int = 4096
+    # the answer is a whole file: a cap from past output lengths would cut a
+    # longer one mid-code, so these agents always get max_output_tokens
+    whole_file_output: bool = False
+
+    # process-wide record/replay cassette (see tools/cassette.py); set by the CLI
+    cassette: Optional[Cassette] = None
+
     def __init__(self, role: str, goal: str, backstory: str) -> None:
         self.role = role
         self.goal = goal
         self.backstory = backstory
+        # per-request timeout in seconds; set by CrewRunner in deadline mode
+        self.request_timeout: Optional[float] = None
+        # set by CrewRunner when the run goes stale; the open stream is closed
+        self.cancel: Optional[threading.Event] = None
+        self.budget = TokenBudget(self.max_input_tokens, self.max_output_tokens)
+        # output-length history; CrewRunner shares its StageStats here
+        self.stats: Optional[StageStats] = None
+        # REPL session memory; sent ahead of the request so the prefix stays cacheable
+        self.context: Optional[str] = None
+        # strip comments/docstrings from code in prompts (see tools/minify.py)
+        self.compact = False
+        self.tokens_saved = 0
 
     @abc.abstractmethod
     def build_prompt(self, *args: Any, **kwargs: Any) -> List[Dict[str, str]]:
         """Return a list of chat messages to send to the LLM."""
 
+    def _fit(self, system_msg: str, *sections: Section) -> List[str]:
+        """Trim prompt sections to this agent's input budget (lowest priority first)."""
+        if self.context:
+            # session context is bounded by SessionMemory and never trimmed here
+            system_msg = system_msg + "\n" + self.context
+        return self.budget.fit(system_msg, sections)
+
+    def _compact(self, code: str) -> Tuple[str, Optional[LineMap]]:
+        """Compact ``code`` for this stage's prompt; the map is None when disabled."""
+        if not self.compact or self.name not in STAGE_POLICIES:
+            return code, None
+        compact, line_map = minify(code, **STAGE_POLICIES[self.name])
+        self.tokens_saved += max(0, estimate_tokens(code) - estimate_tokens(compact))
+        return compact, line_map
+
+    @staticmethod
+    def _usage_tokens(usage: Any) -> Optional[int]:
+        if isinstance(usage, dict):
+            return usage.get("completion_tokens")
+        return getattr(usage, "completion_tokens", None)
+
+    @property
+    def replaying(self) -> bool:
+        """True while answers come from a cassette; they must not feed the stats."""
+        return self.cassette is not None and self.cassette.replaying
+
+    def _record_output(self, content: str, tokens: Optional[int] = None) -> None:
+        if self.stats is None or self.replaying:
+            return
+        if tokens is None:
+            tokens = estimate_tokens(content)
+        self.stats.record(self.name, "output_tokens", tokens)
+
+    def _request(self, messages: List[Dict[str, str]], max_tokens: int) -> Tuple[str, Optional[int], Optional[List[float]]]:
+        """Send one completion request; return (content, output tokens, chunk offsets).
+
+        Endpoints are tried in health order. With more than one endpoint and
+        enough latency history, a call still running after the stage's p95 is
+        duplicated on the next endpoint and the first answer wins. In deadline
+        mode all attempts share ``request_timeout``: a failover only gets what
+        is left of it.
+        """
+        pool = get_endpoint_pool()
+        pool.record_call()
+        candidates = pool.ordered()
+        # hedging cancels a streamed attempt, which the legacy client cannot do
+        hedge_after = self._hedge_delay() if _HAS_NEW_CLIENT and len(candidates) > 1 else None
+        ends_at = time.monotonic() + self.request_timeout if self.request_timeout is not None else None
+        last_exc: Optional[Exception] = None
+        while candidates:
+            if last_exc is not None and ends_at is not None and time.monotonic() >= ends_at:
+                break
+            primary = candidates.pop(0)
+            backup = candidates[0] if hedge_after is not None and candidates else None
+            try:
+                if backup is None:
+                    return self._timed_attempt(pool, primary, messages, max_tokens, ends_at=ends_at)
+                return self._hedged(pool, primary, backup, candidates, messages, max_tokens, hedge_after, ends_at)
+            except _FAILOVER_ERRORS as exc:
+                # unreachable / overloaded endpoint: fail over to the next one
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Observed p95 latency of this stage, or None without enough history."""
+        if not config.DEEPSEEK_HEDGE or self.stats is None:
+            return None
+        if len(self.stats.samples(self.name, "latency")) < _HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.stats.percentile(self.name, "latency", 0.95), _HEDGE_MIN_DELAY)  # type: ignore[arg-type]
+
+    def _timed_attempt(self, pool: EndpointPool, endpoint: Endpoint, messages, max_tokens: int, cancel=None, ends_at=None):
+        started = time.monotonic()
+        try:
+            result = self._attempt(endpoint, messages, max_tokens, cancel, ends_at)
+        except _FAILOVER_ERRORS:
+            pool.mark_failure(endpoint)
+            raise
+        pool.mark_success(endpoint, time.monotonic() - started)
+        return result
+
+    def _hedged(self, pool: EndpointPool, primary: Endpoint, backup: Endpoint, candidates: List[Endpoint], messages, max_tokens: int, hedge_after: float, ends_at=None):
+        """Run on ``primary``; duplicate on ``backup`` after ``hedge_after`` seconds."""
+        cancel = {id(primary): threading.Event(), id(backup): threading.Event()}
+        executor = ThreadPoolExecutor(max_workers=2)
+        futures = {
+            executor.submit(self._timed_attempt, pool, primary, messages, max_tokens, cancel[id(primary)], ends_at): primary,
+        }
+        try:
+            done, _ = wait(futures, timeout=hedge_after)
+            if not done:
+                pool.record_hedge()
+                candidates.remove(backup)
+                futures[executor.submit(self._timed_attempt, pool, backup, messages, max_tokens, cancel[id(backup)], ends_at)] = backup
+            pending = set(futures)
+            last_exc: Optional[BaseException] = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    exc = future.exception()
+                    if exc is not None:
+                        last_exc = exc
+                        continue
+                    if futures[future] is backup:
+                        pool.record_hedge(won=True)
+                    for loser in pending:
+                        cancel[id(futures[loser])].set()
+                        loser.add_done_callback(partial(_charge_loser, pool, estimate_messages(messages)))
+                    return future.result()
+            assert last_exc is not None
+            raise last_exc
+        finally:
+            executor.shutdown(wait=False)
+
+    def _attempt(self, endpoint: Endpoint, messages, max_tokens: int, cancel=None, ends_at=None):
+        """One request against ``endpoint``; streamed when it may need cancelling."""
+        timeout = max(ends_at - time.monotonic(), 0.0) if ends_at is not None else None
+        if not _HAS_NEW_CLIENT:
+            return self._legacy_attempt(endpoint, messages, max_tokens, timeout)
+        client = _client_for(endpoint)
+        if timeout is not None:
+            client = client.with_options(timeout=timeout)
+        cassette = self.cassette
+        cancels = [event for event in (cancel, self.cancel) if event is not None]
+        if cancels or (cassette is not None and cassette.mode == "record" and cassette.stream_chunks):
+            return self._request_streaming(client, messages, max_tokens, cancels)
+        response = client.chat.completions.create(
+            model=config.DEEPSEEK_MODEL,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=max_tokens,
+        )
+        content = response.choices[0].message.content.strip()
+        return content, self._usage_tokens(getattr(response, "usage", None)), None
+
+    @staticmethod
+    def _legacy_attempt(endpoint: Endpoint, messages, max_tokens: int, timeout: Optional[float]):
+        """openai<1.0: per-call key/base so DEEPSEEK_API_BASES failover works too."""
+        extra: Dict[str, Any] = {}
+        if timeout is not None:
+            extra["request_timeout"] = timeout
+        response = openai.ChatCompletion.create(
+            model=config.DEEPSEEK_MODEL,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=max_tokens,
+            api_key=endpoint.api_key,
+            api_base=endpoint.base_url,
+            **extra,
+        )
+        content = response.choices[0].message.content.strip()
+        return content, BaseAgent._usage_tokens(response.get("usage")), None
+
+    @staticmethod
+    def _request_streaming(client: Any, messages: List[Dict[str, str]], max_tokens: int, cancels: Sequence[threading.Event] = ()):
+        """Streamed variant: captures per-chunk timings and can be cancelled mid-answer."""
+        started = time.monotonic()
+        stream = client.chat.completions.create(
+            model=config.DEEPSEEK_MODEL,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parts: List[str] = []
+        offsets: List[float] = []
+        tokens: Optional[int] = None
+        for chunk in stream:
+            if any(event.is_set() for event in cancels):
+                # closing the stream drops the connection so the server stops generating
+                stream.close()
+                raise _AttemptCancelled(estimate_tokens("".join(parts)))
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                offsets.append(time.monotonic() - started)
+            if getattr(chunk, "usage", None) is not None:
+                tokens = BaseAgent._usage_tokens(chunk.usage)
+        return "".join(parts).strip(), tokens, offsets
+
     def _chat(self, messages: List[Dict[str, str]]) -> str:
-        """Call DeepSeek model via OpenAI-compatible API, handling both client versions."""
+        """Call DeepSeek model via OpenAI-compatible API, handling both client versions.
+
+        With a cassette attached the exchange is recorded, or served from the
+        recording without touching the network in replay mode.
+        """
+        if self.cancel is not None and self.cancel.is_set():
+            raise _AttemptCancelled(0)
+        if self.context:
+            messages = self._with_context(messages, self.context)
+        max_tokens = self.budget.max_tokens(self.name, None if self.whole_file_output else self.stats)
+        cassette = self.cassette
+        key = request_key(config.DEEPSEEK_MODEL, messages) if cassette is not None else ""
+        if cassette is not None and cassette.replaying:
+            entry = cassette.replay(self.name, key)
+            self._record_output(entry["r"], entry.get("u"))
+            return entry["r"]
+
+        started = time.monotonic()
         try:
-            if _HAS_NEW_CLIENT:
-                response = _client.chat.completions.create(
-                    model=config.DEEPSEEK_MODEL,
-                    messages=messages,
-                    temperature=0.2,
-                )
-                return response.choices[0].message.content.strip()
-
-            # legacy path
-            response = openai.ChatCompletion.create(
-                model=config.DEEPSEEK_MODEL,
-                messages=messages,
-                temperature=0.2,
-            )
-            return response.choices[0].message.content.strip()
+            content, tokens, chunks = self._request(messages, max_tokens)
         except openai.OpenAIError as e:
             raise RuntimeError(f"API çağrısı başarısız: {str(e)}") from e
+        if cassette is not None:
+            cassette.record(self.name, key, messages, content, time.monotonic() - started, tokens, chunks)
+        self._record_output(content, tokens)
+        return content
 
     def run(self, *args: Any, **kwargs: Any) -> str:
         """High-level method executed by the crew runner."""
         messages = self.build_prompt(*args, **kwargs)
-        return self._chat(messages) 
\ No newline at end of file
+        return self._chat(messages)
+
+    @staticmethod
+    def _with_context(messages: List[Dict[str, str]], context: str) -> List[Dict[str, str]]:
+        """Put ``context`` in front of the first user message.
+
+        System mesajı ve bağlam turdan tura aynı kaldığı için değişen tek
+        kısım en sondaki yeni istektir.
+        """
+        result = [dict(m) for m in messages]
+        for message in result:
+            if message["role"] == "user":
+                message["content"] = f"{context}\n\n## Yeni istek\n{message['content']}"
+                break
+        return result 
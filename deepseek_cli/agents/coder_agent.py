@@ -3,11 +3,18 @@ from __future__ import annotations
 from typing import List, Dict
 
 from .base_agent import BaseAgent
+from deepseek_cli.tools.components import Component
+from deepseek_cli.tools.token_budget import Section
 
 
 class CoderAgent(BaseAgent):
     """Agent that generates Python code for the requested task."""
 
+    name = "code"
+    max_input_tokens = 24000
+    max_output_tokens = 8000
+    whole_file_output = True
+
     def __init__(self) -> None:
         super().__init__(
             role="Python Kodu Üreticisi",
@@ -21,7 +28,35 @@ class CoderAgent(BaseAgent):
             " PE P8 uyumlu ve yorum satırları ekleyerek yaz. Gerekirse ek dosyalar"
             " ve testler için talimat ver."  # noqa: E501
         )
+        (user_request,) = self._fit(system_msg, Section("request", user_request))
         return [
             {"role": "system", "content": system_msg},
             {"role": "user", "content": user_request},
-        ] 
\ No newline at end of file
+        ]
+
+    def build_component_prompt(self, user_request: str, component: Component, overview: str) -> List[Dict[str, str]]:
+        # istek ve bileşen listesi tüm paralel çağrılarda aynı; yalnızca son
+        # satırdaki bileşen adı değişir, böylece prompt önbelleği paylaşılır
+        system_msg = (
+            "Sen kıdemli bir Python geliştiricisisin. Büyük bir programın tek bir"
+            " bileşenini yazıyorsun; tüm bileşenler aynı modülde birleştirilecek."
+            " Yalnızca istenen bileşeni yaz, arayüzündeki imzalara birebir uy."
+            " Diğer bileşenlerin arayüzlerini tanımlıymış gibi doğrudan kullan;"
+            " onları yeniden tanımlama ve import etme. Importları dosyanın başına koy."
+        )
+        user_request, overview = self._fit(
+            system_msg,
+            Section("request", user_request, priority=1),
+            Section("components", overview, priority=2),
+        )
+        return [
+            {"role": "system", "content": system_msg},
+            {
+                "role": "user",
+                "content": f"{user_request}\n\n## Bileşenler\n{overview}\n\n## Yazılacak bileşen: {component.name}",
+            },
+        ]
+
+    def run_component(self, user_request: str, component: Component, overview: str) -> str:
+        """Generate the code of one component (called in parallel by CrewRunner)."""
+        return self._chat(self.build_component_prompt(user_request, component, overview))
@@ -3,11 +3,17 @@ from __future__ import annotations
 from typing import List, Dict
 
 from .base_agent import BaseAgent
+from deepseek_cli.tools.token_budget import Section
 
 
 class FixerAgent(BaseAgent):
     """Agent that applies fixes to code based on review feedback."""
 
+    name = "fix"
+    max_input_tokens = 32000
+    max_output_tokens = 8000
+    whole_file_output = True
+
     def __init__(self) -> None:
         super().__init__(
             role="Kod Düzeltme Uzmanı",
@@ -20,10 +26,18 @@ class FixerAgent(BaseAgent):
             "Aşağıda verilen kodu ve inceleme notlarını kullanarak kodu düzelt. "
             "Nihai kodu yalnızca tek bir kod bloğu içinde döndür."
         )
+        # the answer replaces the whole file, so the code is never trimmed;
+        # long review notes / pytest logs are, keeping their tail where the
+        # failure summary lives (PromptTooLarge if the code alone is too big)
+        code_snippet, review_notes = self._fit(
+            system_msg,
+            Section("code", code_snippet, priority=2, required=True),
+            Section("notes", review_notes, priority=1, keep="tail"),
+        )
         user_content = (
             f"Kod:\n{code_snippet}\n\nİnceleme Notları:\n{review_notes}"
         )
         return [
             {"role": "system", "content": system_msg},
             {"role": "user", "content": user_content},
-        ] 
\ No newline at end of file
+        ]
@@ -3,11 +3,16 @@ from __future__ import annotations
 from typing import List, Dict
 
 from .base_agent import BaseAgent
+from deepseek_cli.tools.token_budget import Section
 
 
 class PlannerAgent(BaseAgent):
     """Agent responsible for decomposing a high-level user request into actionable steps."""
 
+    name = "plan"
+    max_input_tokens = 16000
+    max_output_tokens = 1024
+
     def __init__(self) -> None:
         super().__init__(
             role="Yazılım Planlayıcısı",
@@ -24,7 +29,28 @@ class PlannerAgent(BaseAgent):
             " ve sıralı görevlere parçala. Her adımı açık, kısa ve yapılabilir şekilde"
             " numaralandır. Gerektiğinde ek görevler ekle, ancak gereksiz detay verme."
         )
+        (user_request,) = self._fit(system_msg, Section("request", user_request))
+        return [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_request},
+        ]
+
+    def build_components_prompt(self, user_request: str) -> List[Dict[str, str]]:
+        system_msg = (
+            "Sen bir yazılım mimarısın. Kullanıcı talebini tek bir Python modülü"
+            " içinde bağımsız üretilebilecek 2-8 bileşene böl (örn. modeller, auth,"
+            " rotalar). Her bileşenin diğerlerine açtığı arayüzü tam imzalarla yaz."
+            " Yalnızca şu biçimde JSON döndür:\n"
+            '{"components": [{"name": "models", "purpose": "kısa açıklama",'
+            ' "interface": ["class User", "def get_user(user_id: int) -> User"],'
+            ' "depends_on": []}]}'
+        )
+        (user_request,) = self._fit(system_msg, Section("request", user_request))
         return [
             {"role": "system", "content": system_msg},
             {"role": "user", "content": user_request},
-        ] 
\ No newline at end of file
+        ]
+
+    def components(self, user_request: str) -> str:
+        """Return the raw JSON component list for map-reduce code generation."""
+        return self._chat(self.build_components_prompt(user_request))
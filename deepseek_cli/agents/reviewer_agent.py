@@ -3,11 +3,16 @@ from __future__ import annotations
 from typing import List, Dict
 
 from .base_agent import BaseAgent
+from deepseek_cli.tools.token_budget import Section
 
 
 class ReviewerAgent(BaseAgent):
     """Agent that reviews code for quality, risks and improvements."""
 
+    name = "review"
+    max_input_tokens = 24000
+    max_output_tokens = 2048
+
     def __init__(self) -> None:
         super().__init__(
             role="Kod İnceleme Uzmanı",
@@ -21,7 +26,50 @@ class ReviewerAgent(BaseAgent):
             "güvenlik açıklarını madde madde belirt. Gerektiğinde örnek düzeltme "
             "kodu öner."
         )
+        (code_snippet,) = self._fit(system_msg, Section("code", code_snippet))
+        return [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": code_snippet},
+        ]
+
+    def run(self, code_snippet: str) -> str:  # type: ignore[override]
+        code_snippet, line_map = self._compact(code_snippet)
+        review = self._chat(self.build_prompt(code_snippet))
+        # notes must point at lines of the code that is actually saved
+        return line_map.refs_to_original(review) if line_map is not None else review
+
+
+# focus → what the sub-reviewer looks for; kept short so the prompts stay cheap
+REVIEW_FOCUSES: Dict[str, str] = {
+    "security": "yalnızca güvenlik açıklarını (enjeksiyon, kimlik doğrulama, gizli bilgi sızıntısı, güvensiz varsayılanlar)",
+    "correctness": "yalnızca mantık hatalarını, yakalanmayan hata durumlarını ve yanlış sonuç üreten kenar durumlarını",
+    "performance": "yalnızca performans sorunlarını (gereksiz döngüler, tekrar eden I/O, bellek israfı, bloklayan çağrılar)",
+    "style": "yalnızca okunabilirlik ve PEP 8 sorunlarını (isimlendirme, tekrar eden kod, eksik docstring)",
+}
+
+
+class FocusedReviewerAgent(ReviewerAgent):
+    """Sub-reviewer that only checks one aspect, for the parallel review mode."""
+
+    max_input_tokens = 16000
+    max_output_tokens = 512
+
+    def __init__(self, focus: str) -> None:
+        if focus not in REVIEW_FOCUSES:
+            raise ValueError(f"Bilinmeyen inceleme odağı: {focus}")
+        super().__init__()
+        self.focus = focus
+        self.name = f"review_{focus}"
+
+    def build_prompt(self, code_snippet: str) -> List[Dict[str, str]]:  # type: ignore[override]
+        system_msg = (
+            f"Aşağıdaki kodda {REVIEW_FOCUSES[self.focus]} incele. En önemli en fazla 5"
+            " bulguyu her satıra bir tane olacak şekilde yaz:\n"
+            "- [yüksek|orta|düşük] satır N: kısa açıklama ve önerilen düzeltme\n"
+            "Sorun yoksa yalnızca 'Sorun yok' yaz."
+        )
+        (code_snippet,) = self._fit(system_msg, Section("code", code_snippet))
         return [
             {"role": "system", "content": system_msg},
             {"role": "user", "content": code_snippet},
-        ] 
\ No newline at end of file
+        ]
@@ -3,11 +3,17 @@ from __future__ import annotations
 from typing import List, Dict
 
 from .base_agent import BaseAgent
+from deepseek_cli.tools.token_budget import Section
 
 
 class TestAgent(BaseAgent):
     """Agent that produces pytest unit tests for the generated code."""
 
+    name = "tests"
+    max_input_tokens = 24000
+    max_output_tokens = 4096
+    whole_file_output = True
+
     def __init__(self) -> None:
         super().__init__(
             role="Test Yazarı",
@@ -21,7 +27,12 @@ class TestAgent(BaseAgent):
             "Tüm fonksiyonları ve ana senaryoları kapsa. Sadece test kodunu, "
             "```python``` bloğu içinde döndür."
         )
+        (code_snippet,) = self._fit(system_msg, Section("code", code_snippet))
         return [
             {"role": "system", "content": system_msg},
             {"role": "user", "content": code_snippet},
-        ] 
\ No newline at end of file
+        ]
+
+    def run(self, code_snippet: str) -> str:  # type: ignore[override]
+        code_snippet, _ = self._compact(code_snippet)
+        return self._chat(self.build_prompt(code_snippet))
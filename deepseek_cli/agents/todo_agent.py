@@ -3,11 +3,16 @@ from __future__ import annotations
 from typing import List, Dict
 
 from .base_agent import BaseAgent
+from deepseek_cli.tools.token_budget import Section
 
 
 class TodoAgent(BaseAgent):
     """Agent that turns user prompt into a TODO markdown list."""
 
+    name = "todo"
+    max_input_tokens = 16000
+    max_output_tokens = 1024
+
     def __init__(self) -> None:
         super().__init__(
             role="Görev Takip Uzmanı",
@@ -20,6 +25,7 @@ class TodoAgent(BaseAgent):
             "Sen proje yöneticisisin. Kullanıcı talebine dayanarak, GitHub markdown"
             " formatında yapılacaklar listesi oluştur. - [ ] checkbox kullan."
         )
+        (user_request,) = self._fit(system_msg, Section("request", user_request))
         return [
             {"role": "system", "content": system_msg},
             {"role": "user", "content": user_request},
@@ -9,10 +9,17 @@ import re
 
 import click
 from rich import print as rprint
+from rich.console import Console
 
 import openai
 
-from deepseek_cli.crew_runner import CrewRunner
+from deepseek_cli.agents.base_agent import BaseAgent
+from deepseek_cli.agents.reviewer_agent import REVIEW_FOCUSES
+from deepseek_cli.crew_runner import CHECKPOINT_ORDER, CrewRunner
+from deepseek_cli.output import OUTPUT_MODES, make_output
+from deepseek_cli.tools.cassette import Cassette
+from deepseek_cli.tools.checkpoint import RunStore
+from deepseek_cli.watch import Watcher
 from deepseek_cli.tools.file_tools import write_text_to_file
 
 # user preference file to remember 'always save' choice
@@ -32,6 +39,23 @@ def _save_user_config(cfg: dict) -> None:
     CONFIG_PATH.write_text(json.dumps(cfg))
 
 
+# feature menu of main() and the sub-reviewers --parallel-review runs for each
+FEATURE_REVIEWERS = {
+    'auth': ('security', 'correctness'),
+    'api': ('security', 'correctness', 'performance'),
+    'db': ('security', 'correctness', 'performance'),
+    'ui': ('correctness', 'style'),
+    'test': ('correctness', 'style'),
+    'ci': ('security', 'correctness'),
+    'cache': ('correctness', 'performance'),
+    'logging': ('security', 'style'),
+    'config': ('security', 'correctness'),
+    'utils': ('correctness', 'style'),
+    'other': ('security', 'correctness', 'performance', 'style'),
+}
+FEATURES = list(FEATURE_REVIEWERS)
+
+
 # try to access config module for updating constant dynamically
 try:
     config_module = importlib.import_module("deepseek_cli.config")
@@ -53,15 +77,59 @@ def print_quick_usage():
 @click.option('--feature', 'feature', type=str, default=None, help='Bir özellik seçin (örn: auth, api, db, ui, ...).')
 @click.option('--save', 'save_path', type=click.Path(dir_okay=False), help='File path to save the output (default: auto name in current directory).')
 @click.option('--plan/--no-plan', default=False, help='Generate plan output.')
+@click.option('--compact', 'compact', type=str, default=None, help="Yorum/docstring'leri çıkarılmış kod gönderilecek aşamalar (review, tests; 'none' kapatır).")
+@click.option('--parallel-review', is_flag=True, default=False, help='İncelemeyi özelliğe göre seçilen odaklı alt reviewer\'larla paralel yap.')
+@click.option('--reviewers', 'reviewers', type=str, default=None, help='Paralel incelemede kullanılacak odaklar (security,correctness,performance,style); --parallel-review ima eder.')
+@click.option('--split', is_flag=True, default=False, help='Büyük istekleri bileşenlere böl, bileşenleri paralel üretip birleştir.')
 @click.option('--api-key', 'api_key', type=str, help='Provide your DeepSeek API key.')
-
-def main(feature: str | None, save_path: str | None, plan: bool, api_key: str | None) -> None:
-    print_quick_usage()
+@click.option('--deadline', 'deadline', type=click.FloatRange(min=0, min_open=True), default=None, help='Toplam süre sınırı (saniye); opsiyonel aşamalar gerekirse atlanır.')
+@click.option('--prompt', 'prompt_text', type=str, default=None, help='İstek metni (verilirse sorulmaz).')
+@click.option('--prompt-file', 'prompt_file', type=click.Path(exists=True, dir_okay=False), default=None, help='İstek metnini dosyadan oku.')
+@click.option('--watch', is_flag=True, default=False, help='--prompt-file ve --save dosyalarını izle; değişince yalnızca etkilenen aşamaları yeniden çalıştır.')
+@click.option('--output', 'output_mode', type=click.Choice(OUTPUT_MODES), default='rich', show_default=True, help='Çıktı modu: rich, live (sabit hızlı canlı görünüm), json / ndjson (render yok).')
+@click.option('--record', 'record_path', type=click.Path(dir_okay=False), default=None, help='API istek/yanıtlarını bu cassette dosyasına kaydet (.gz ile sıkıştırılır).')
+@click.option('--record-chunks', is_flag=True, default=False, help='Kayıt sırasında yanıtları stream ederek parça zamanlarını da sakla.')
+@click.option('--replay', 'replay_path', type=click.Path(exists=True, dir_okay=False), default=None, help='API yerine bu cassette dosyasındaki yanıtları kullan.')
+@click.option('--replay-speed', type=click.FloatRange(min=0), default=1.0, show_default=True, help='Replay gecikme çarpanı (1 orijinal, 0 beklemesiz).')
+@click.option('--resume', 'resume_id', type=str, default=None, help='Yarıda kalan bir çalıştırmaya son tamamlanan aşamadan devam et (RUN_ID).')
+@click.option('--from-stage', 'from_stage', type=click.Choice(CHECKPOINT_ORDER), default=None, help='--resume ile: bu aşamadan itibaren yeniden çalıştır (önceki aşama dosyaları düzenlenebilir).')
+
+def main(feature: str | None, save_path: str | None, plan: bool, api_key: str | None, deadline: float | None, prompt_text: str | None, output_mode: str, record_path: str | None, record_chunks: bool, replay_path: str | None, replay_speed: float, resume_id: str | None, from_stage: str | None, prompt_file: str | None, watch: bool, split: bool, compact: str | None, parallel_review: bool, reviewers: str | None) -> None:
+    headless = output_mode in {"json", "ndjson"}
+    # headless modda stdout yalnızca JSON içerir; insan mesajları stderr'e gider
+    say = Console(stderr=True).print if headless else rprint
+
+    if watch and not (prompt_file and save_path):
+        say("[bold red]--watch için --prompt-file ve --save gerekli.")
+        sys.exit(2)
+    if prompt_file and not prompt_text:
+        prompt_text = Path(prompt_file).read_text(encoding="utf-8").strip()
+
+    run_store: RunStore | None = None
+    if from_stage and not resume_id:
+        say("[bold red]--from-stage yalnızca --resume ile kullanılabilir.")
+        sys.exit(2)
+    if resume_id:
+        try:
+            run_store = RunStore.open(resume_id)
+        except FileNotFoundError as exc:
+            say(f"[bold red]{exc}")
+            sys.exit(1)
+        feature = run_store.meta.get("feature", feature)
+        prompt_text = run_store.meta.get("prompt", prompt_text)
+        plan = run_store.meta.get("plan", plan)
+        split = run_store.meta.get("split", split)
+        reviewers = run_store.meta.get("reviewers", reviewers)
+        parallel_review = bool(reviewers) or parallel_review
+        if from_stage:
+            run_store.discard_from(from_stage, CHECKPOINT_ORDER)
+    if headless and not (feature and prompt_text):
+        say("[bold red]json/ndjson modunda --feature ve --prompt zorunludur.")
+        sys.exit(2)
+    if not headless:
+        print_quick_usage()
     """Use Claude-like code capabilities powered by DeepSeek from the terminal."""
     # Özellik menüsü
-    FEATURES = [
-        'auth', 'api', 'db', 'ui', 'test', 'ci', 'cache', 'logging', 'config', 'utils', 'other'
-    ]
     if not feature:
         rprint("[bold cyan]Lütfen bir özellik seçin:")
         for idx, f in enumerate(FEATURES, 1):
@@ -77,12 +145,13 @@ def main(feature: str | None, save_path: str | None, plan: bool, api_key: str |
         else:
             rprint(f"[bold red]Geçersiz seçim: {secim}")
             sys.exit(1)
-    rprint(f"[bold green]Seçilen özellik: {feature}")
+    if not headless:
+        rprint(f"[bold green]Seçilen özellik: {feature}")
 
     # Promptu kullanıcıdan iste
-    prompt = click.prompt("Lütfen bu özellik için ne yapılacağını yazın", default="", show_default=False)
+    prompt = prompt_text or click.prompt("Lütfen bu özellik için ne yapılacağını yazın", default="", show_default=False)
     if not prompt.strip():
-        rprint("[bold red]Prompt girilmedi! Çıkılıyor...")
+        say("[bold red]Prompt girilmedi! Çıkılıyor...")
         sys.exit(1)
 
     # API key işlemleri
@@ -95,22 +164,100 @@ def main(feature: str | None, save_path: str | None, plan: bool, api_key: str |
         with env_file.open("a", encoding="utf-8") as f:
             f.write(f"\nDEEPSEEK_API_KEY={api_key}\n")
 
-    # anahtar yoksa prompt et
-    _ensure_api_key(api_key)
+    compact_stages = None
+    if compact is not None:
+        compact_stages = [s.strip() for s in compact.split(",") if s.strip() and s.strip() != "none"]
+        unknown = set(compact_stages) - {"review", "tests"}
+        if unknown:
+            say(f"[bold red]--compact için geçersiz aşama: {', '.join(sorted(unknown))}")
+            sys.exit(2)
+
+    review_foci = None
+    if reviewers:
+        review_foci = [r.strip() for r in reviewers.split(",") if r.strip()]
+        unknown = set(review_foci) - set(REVIEW_FOCUSES)
+        if unknown:
+            say(f"[bold red]--reviewers için geçersiz odak: {', '.join(sorted(unknown))}")
+            sys.exit(2)
+    elif parallel_review:
+        review_foci = list(FEATURE_REVIEWERS.get(feature, FEATURE_REVIEWERS['other']))
+
+    if record_path and replay_path:
+        say("[bold red]--record ve --replay birlikte kullanılamaz.")
+        sys.exit(2)
+    if not (record_path or replay_path) and config_module is not None and config_module.DEEPSEEK_CASSETTE:
+        # DEEPSEEK_CASSETTE* stand in for the flags (e.g. in CI)
+        cassette_mode = config_module.DEEPSEEK_CASSETTE_MODE
+        if cassette_mode not in Cassette.MODES:
+            say(f"[bold red]DEEPSEEK_CASSETTE_MODE 'record' veya 'replay' olmalı: {cassette_mode!r}")
+            sys.exit(2)
+        if cassette_mode == "record":
+            record_path = config_module.DEEPSEEK_CASSETTE
+        else:
+            replay_path = config_module.DEEPSEEK_CASSETTE
+            try:
+                replay_speed = float(config_module.DEEPSEEK_REPLAY_SPEED)
+                if replay_speed < 0:
+                    raise ValueError(replay_speed)
+            except ValueError:
+                say(f"[bold red]DEEPSEEK_REPLAY_SPEED sıfır veya pozitif bir sayı olmalı: {config_module.DEEPSEEK_REPLAY_SPEED!r}")
+                sys.exit(2)
+    try:
+        if replay_path:
+            BaseAgent.cassette = Cassette(replay_path, mode="replay", speed=replay_speed)
+        elif record_path:
+            BaseAgent.cassette = Cassette(record_path, mode="record", stream_chunks=record_chunks)
+    except FileNotFoundError as exc:
+        say(f"[bold red]{exc}")
+        sys.exit(1)
+
+    # anahtar yoksa prompt et (replay modunda API kullanılmaz)
+    if not replay_path:
+        _ensure_api_key(api_key)
 
     pref_cfg = _load_user_config()
     always_save_pref = pref_cfg.get("always_save", False)
 
-    runner = CrewRunner(prompt=f"[{feature}] {prompt}", save_path=save_path, plan=plan)
+    if run_store is None:
+        run_store = RunStore.create(
+            f"[{feature}] {prompt}",
+            meta={
+                "feature": feature,
+                "prompt": prompt,
+                "plan": plan,
+                "split": split,
+                "reviewers": ",".join(review_foci) if review_foci else None,
+            },
+        )
+
+    if watch:
+        _watch(prompt_file, save_path, feature, plan, split, compact_stages, review_foci, deadline, make_output(output_mode), run_store, say)
+        return
+
+    runner = CrewRunner(
+        # prompt.txt düzenlenmiş olabilir; her zaman run dizininden oku
+        prompt=run_store.prompt,
+        save_path=save_path,
+        plan=plan,
+        split=split,
+        compact=compact_stages,
+        reviewers=review_foci,
+        deadline=deadline,
+        output=make_output(output_mode),
+        run_store=run_store,
+        # REPL runs carry the session context they were started with
+        context=run_store.meta.get("context"),
+    )
     try:
-        # Plan oluşturulacaksa önce planı göster
-        if plan:
+        # Plan oluşturulacaksa önce planı göster (deadline/headless/resume modda onay beklenmez)
+        if plan and deadline is None and not headless and not resume_id:
             rprint("[yellow]📝 Plan oluşturuluyor...")
             plan_output = runner._planner.run(f"[{feature}] {prompt}")
             rprint(plan_output)
             devam = click.prompt("Devam edilsin mi? (e/h)", type=str, default="e")
             if devam.lower() != "e":
                 rprint("[bold red]İşlem iptal edildi.")
+                run_store.remove()
                 sys.exit(0)
         # Plan yoksa veya devam edilsin dendi ise normal akış
         fixed_code, _ = runner.run()
@@ -123,7 +270,7 @@ def main(feature: str | None, save_path: str | None, plan: bool, api_key: str |
         default_filename = _template_map.get(ext, f"{project_slug}{ext}")
         suggested_path = str(project_dir / default_filename)
 
-        if save_path is None and not always_save_pref:
+        if save_path is None and not always_save_pref and not headless:
             choice = click.prompt(
                 f"Dosyalar {suggested_path} konumuna kaydedilsin mi? [e]vet / [h]ayır / [a]lways",
                 type=click.Choice(["e", "h", "a"], case_sensitive=False),
@@ -139,18 +286,48 @@ def main(feature: str | None, save_path: str | None, plan: bool, api_key: str |
         elif save_path:  # kullanıcı --save ile verdi
             clean_code = _strip_code_block_markers(fixed_code)
             write_text_to_file(save_path, clean_code)
-            rprint(f"[bold green]Kod kaydedildi: {save_path}.")
+            say(f"[bold green]Kod kaydedildi: {save_path}.")
         else:
             # always_save_pref geçerli ise otomatik kaydet
             if always_save_pref:
                 clean_code = _strip_code_block_markers(fixed_code)
                 write_text_to_file(suggested_path, clean_code)
-                rprint(f"[bold green]Kod otomatik kaydedildi: {suggested_path}.")
+                say(f"[bold green]Kod otomatik kaydedildi: {suggested_path}.")
+        # checkpoints are only needed to --resume a failed or killed run
+        run_store.remove()
     except Exception as exc:
-        rprint(f"[bold red]Hata oluştu:[/bold red] {exc}")
+        say(f"[bold red]Hata oluştu:[/bold red] {exc}")
         sys.exit(1)
 
 
+def _watch(prompt_file, save_path, feature, plan, split, compact, reviewers, deadline, output, run_store, say) -> None:
+    """Run the pipeline on every prompt/code change until Ctrl+C."""
+    # background runs cannot ask questions
+    output.interactive = False
+
+    def make_runner(text, code, cancel):
+        return CrewRunner(
+            prompt=f"[{feature}] {text.strip()}",
+            plan=plan,
+            split=split,
+            compact=compact,
+            reviewers=reviewers,
+            deadline=deadline,
+            output=output,
+            run_store=run_store,
+            code=code,
+            cancel=cancel,
+        )
+
+    watcher = Watcher(prompt_file, save_path, make_runner, on_error=lambda exc: say(f"[bold red]Hata oluştu:[/bold red] {exc}"))
+    say(f"[cyan]👀 {prompt_file} ve {save_path} izleniyor (çıkmak için Ctrl+C)...")
+    try:
+        watcher.loop()
+    except KeyboardInterrupt:
+        say("[yellow]İzleme durduruldu.")
+        run_store.remove()
+
+
 def _detect_language(code: str) -> str:
     match = re.search(r"```(\w+)", code)
     if match:
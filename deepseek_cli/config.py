@@ -17,8 +17,38 @@ DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
 DEEPSEEK_MODEL = os.getenv("DEEPSEEK_MODEL", "deepseek-coder")
 DEEPSEEK_API_BASE = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1")
 
+# optional comma separated endpoint/key lists for failover and hedging;
+# a single key is shared by all endpoints
+DEEPSEEK_API_BASES = [b.strip() for b in os.getenv("DEEPSEEK_API_BASES", "").split(",") if b.strip()] or [DEEPSEEK_API_BASE]
+DEEPSEEK_API_KEYS = [k.strip() for k in os.getenv("DEEPSEEK_API_KEYS", "").split(",") if k.strip()]
+# duplicate slow calls to a second endpoint after the stage's observed p95
+DEEPSEEK_HEDGE = os.getenv("DEEPSEEK_HEDGE", "1").lower() not in {"0", "false", "no"}
+
+# record/replay cassette for offline runs (e.g. CI benchmarks); used by the CLI
+# when neither --record nor --replay is given
+DEEPSEEK_CASSETTE = os.getenv("DEEPSEEK_CASSETTE", "")
+DEEPSEEK_CASSETTE_MODE = os.getenv("DEEPSEEK_CASSETTE_MODE", "replay")
+# parsed (and validated) by the CLI
+DEEPSEEK_REPLAY_SPEED = os.getenv("DEEPSEEK_REPLAY_SPEED", "1.0")
+
+# REPL turns are checkpointed under .deepseek_runs/ only when enabled
+DEEPSEEK_REPL_CHECKPOINTS = os.getenv("DEEPSEEK_REPL_CHECKPOINTS", "0").lower() not in {"0", "false", "no"}
+
+# token budget of the REPL session memory carried between turns
+DEEPSEEK_SESSION_TOKENS = int(os.getenv("DEEPSEEK_SESSION_TOKENS", "6000"))
+
+# stages whose prompts get comment/docstring-free code (off unless set, e.g.
+# "review,tests"); the fixer is never compacted since its answer is saved
+DEEPSEEK_COMPACT = [
+    s.strip() for s in os.getenv("DEEPSEEK_COMPACT", "").split(",") if s.strip() and s.strip() != "none"
+]
+
+# replay patches that fixed the same pytest failure signature before calling the fixer
+# (opt-in: the memo persists across runs under the package data directory)
+DEEPSEEK_FIX_MEMO = os.getenv("DEEPSEEK_FIX_MEMO", "0").lower() not in {"0", "false", "no"}
+
 # fallback check to warn developer when key is missing
-if not DEEPSEEK_API_KEY:
+if not DEEPSEEK_API_KEY and not (DEEPSEEK_CASSETTE and DEEPSEEK_CASSETTE_MODE == "replay"):
     # avoid noisy output in production, only warn in dev mode
     if os.getenv("PYTHON_ENV", "development") == "development":
         print("[WARN][config] DEEPSEEK_API_KEY environment variable is not set. API calls will fail.") 
\ No newline at end of file
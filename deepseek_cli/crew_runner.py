@@ -2,15 +2,16 @@ from __future__ import annotations
 
 import re
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 import subprocess
 import tempfile
 import sys
 
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
 import click
 
 from deepseek_cli.agents import (
@@ -18,13 +19,44 @@ from deepseek_cli.agents import (
     TodoAgent,
     CoderAgent,
     ReviewerAgent,
+    FocusedReviewerAgent,
     FixerAgent,
     TestAgent,
 )
+from deepseek_cli import config
+from deepseek_cli.agents.base_agent import endpoint_report
+from deepseek_cli.output import OutputBackend, RichOutput
+from deepseek_cli.tools.checkpoint import RunStore, input_key
+from deepseek_cli.tools.components import check_merged, merge_components, parse_components
+from deepseek_cli.tools.deadline import Deadline, DeadlineExceeded, OPTIONAL_STAGES
+from deepseek_cli.tools.findings import merge_findings, render_findings
+from deepseek_cli.tools.fix_memo import Failure, FixMemo, parse_failures
 from deepseek_cli.tools.file_tools import write_text_to_file
+from deepseek_cli.tools.stage_stats import StageStats
 from deepseek_cli.tools.todo_writer import save_todo_markdown
+from deepseek_cli.tools.token_budget import PromptTooLarge
 
-console = Console()
+# pipeline order; code and tests are always executed
+STAGE_ORDER = ("plan", "todo", "code", "review", "fix", "tests")
+REQUIRED_STAGES = ("code", "tests")
+# map-reduce code generation (split=True): component list, then one call per component
+SPLIT_STAGES = ("components", "component")
+# pipeline position of the split stages, used for deadline reserves
+_STAGE_SLOT = {"components": "plan", "component": "code"}
+# checkpoint names; "test_fix" holds the latest code from the test-fix loop
+CHECKPOINT_ORDER = ("plan", "todo", "components") + STAGE_ORDER[2:] + ("test_fix",)
+
+
+class _StageSkipped(Exception):
+    """Raised internally when an optional stage is dropped or cut short."""
+
+
+class _ComponentsFailed(RuntimeError):
+    """Raised internally when a component could not be generated even on its own."""
+
+
+class StageCancelled(Exception):
+    """Raised when the runner's `cancel` event is set (e.g. its inputs went stale)."""
 
 
 class CrewRunner:
@@ -32,6 +64,37 @@ class CrewRunner:
 
     Eğer `save_path` parametresi verilmezse çalışılan dizine, prompt'a dayalı
     otomatik bir dosya adı (.py uzantılı) oluşturulur.
+
+    `deadline` (saniye) verilirse opsiyonel aşamalar (plan, todo, review, fix
+    turları) kalan süreye sığmıyorsa atlanır veya kesilir; atlananlar
+    `dropped_stages` içinde raporlanır.
+
+    Çıktılar doğrudan yazdırılmaz; `output` backend'ine olay olarak gönderilir
+    (varsayılan: Rich arayüzü).
+
+    `run_store` verilirse her aşamanın çıktısı bittiği anda run dizinine
+    yazılır ve girdileri aynı kalan aşamalar yeniden çalıştırılmaz (resume /
+    watch). `code` elle düzenlenmiş kodu kod aşamasının yerine koyar;
+    `cancel` set edildiğinde açık API stream'leri kapatılır, pytest süreci
+    sonlandırılır ve `StageCancelled` yükseltilir.
+    `split` büyük istekler için map-reduce üretimi açar: PlannerAgent
+    bileşenleri arayüzleriyle listeler, her bileşen paralel bir CoderAgent
+    çağrısıyla yazılır ve yerelde birleştirilip import/imza tutarlılığı
+    denetlenir. Liste kullanılamazsa tek parça üretime dönülür.
+
+    `compact` review/tests aşamalarından hangilerine kodun yorumsuz ve
+    docstring'siz halinin gönderileceğini seçer (varsayılan
+    `DEEPSEEK_COMPACT`); satır numaraları orijinal koda geri çevrilir.
+
+    `reviewers` verilirse (örn. ``["security", "correctness"]``) tek uzun
+    inceleme yerine odaklı alt reviewer'lar paralel çalışır; bulguları
+    yerelde tekilleştirilip önem sırasına dizilerek FixerAgent'a verilir.
+
+    `fix_memo` test döngüsünde bilinen hata imzalarına kayıtlı yamaları
+    FixerAgent'tan önce yerelde uygular (varsayılan: `DEEPSEEK_FIX_MEMO`).
+
+    `context` REPL oturum belleğidir (`SessionMemory.context()`); plan, todo
+    ve kod aşamalarının isteğinin önüne eklenir.
     """
 
     def __init__(
@@ -39,11 +102,38 @@ class CrewRunner:
         prompt: str,
         save_path: Optional[str] = None,
         plan: bool = False,
+        deadline: Optional[float] = None,
+        stats: Optional[StageStats] = None,
+        output: Optional[OutputBackend] = None,
+        run_store: Optional[RunStore] = None,
+        code: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        context: Optional[str] = None,
+        split: bool = False,
+        compact: Optional[Sequence[str]] = None,
+        reviewers: Optional[Sequence[str]] = None,
+        fix_memo: Optional[FixMemo] = None,
     ) -> None:
         self.prompt = prompt
         self.explicit_save = save_path is not None
         self.save_path = save_path or self._generate_default_filename()
         self.plan_enabled = plan
+        self.deadline_seconds = deadline
+        self.stats = stats if stats is not None else StageStats()
+        self.output = output if output is not None else RichOutput()
+        self.run_store = run_store
+        self.code_override = code
+        self.cancel = cancel
+        self.split = split
+        self.compact = tuple(config.DEEPSEEK_COMPACT if compact is None else compact)
+        self.reviewers = tuple(reviewers or ())
+        if fix_memo is None and config.DEEPSEEK_FIX_MEMO:
+            fix_memo = FixMemo()
+        self.fix_memo = fix_memo
+        self.dropped_stages: List[str] = []
+        self._merge_required: List[str] = []
+        self._merge_issues: List[str] = []
+        self._deadline: Optional[Deadline] = None
 
         # initialize agents lazily only when needed
         self._planner = PlannerAgent()
@@ -52,6 +142,26 @@ class CrewRunner:
         self._reviewer = ReviewerAgent()
         self._fixer = FixerAgent()
         self._tester = TestAgent()
+        # separate instances so split calls keep their own output-length history
+        self._architect = PlannerAgent()
+        self._architect.name = "components"
+        self._part_coder = CoderAgent()
+        self._part_coder.name = "component"
+        self._focused_reviewers = [FocusedReviewerAgent(focus) for focus in self.reviewers]
+        for stage in STAGE_ORDER + SPLIT_STAGES:
+            # agents size max_tokens from this shared output-length history
+            self._stage_agent(stage).stats = self.stats
+        for stage in ("review", "tests"):
+            self._stage_agent(stage).compact = stage in self.compact
+        for agent in self._focused_reviewers:
+            agent.stats = self.stats
+            agent.compact = "review" in self.compact
+        for agent in [self._stage_agent(s) for s in STAGE_ORDER + SPLIT_STAGES] + self._focused_reviewers:
+            # a cancelled run closes the agents' open API streams
+            agent.cancel = cancel
+        for agent in (self._planner, self._todoer, self._coder, self._architect, self._part_coder):
+            # only the stages that read the user request need earlier turns
+            agent.context = context
 
     # ------------------------------------------------------------------
     # Helper methods
@@ -77,56 +187,460 @@ class CrewRunner:
             counter += 1
         return str(path)
 
-    def _strip(self, code: str) -> str:
+    @staticmethod
+    def _strip(code: str) -> str:
         """Remove markdown code block markers if present."""
         import re as _re
         code = _re.sub(r'^```(?:\w+)?\s*\n?', '', code.strip())
         code = _re.sub(r'\n?```$', '', code)
         return code.strip()
 
+    def _stage_agent(self, stage: str):
+        return {
+            "plan": self._planner,
+            "todo": self._todoer,
+            "code": self._coder,
+            "review": self._reviewer,
+            "fix": self._fixer,
+            "tests": self._tester,
+            "components": self._architect,
+            "component": self._part_coder,
+        }[stage]
+
+    @staticmethod
+    def _later_required(stage: str) -> List[str]:
+        index = STAGE_ORDER.index(_STAGE_SLOT.get(stage, stage))
+        return [s for s in STAGE_ORDER[index + 1:] if s in REQUIRED_STAGES]
+
+    def _emit(self, event: str, **data) -> None:
+        self.output.emit(event, **data)
+
+    def _message(self, text: str, level: str = "info") -> None:
+        self._emit("message", level=level, text=text)
+
+    def _drop(self, label: str, reason: str) -> None:
+        self.dropped_stages.append(label)
+        self._emit("dropped", stage=label, reason=reason)
+        self._message(f"⏱️ '{label}' aşaması atlandı ({reason}).", "warning")
+
+    def _check_cancel(self) -> None:
+        if self.cancel is not None and self.cancel.is_set():
+            raise StageCancelled()
+
+    def _call_with_timeout(self, func, args, timeout: Optional[float]):
+        """Run ``func`` in a worker thread; stop waiting after ``timeout`` or on cancel."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(func, *args)
+        ends_at = time.monotonic() + max(timeout, 0.0) if timeout is not None else None
+        try:
+            while True:
+                self._check_cancel()
+                wait_for = None if self.cancel is None else 0.1
+                if ends_at is not None:
+                    left = max(0.0, ends_at - time.monotonic())
+                    wait_for = left if wait_for is None else min(wait_for, left)
+                try:
+                    return future.result(timeout=wait_for)
+                except FutureTimeout:
+                    if ends_at is not None and time.monotonic() >= ends_at:
+                        raise
+        finally:
+            future.cancel()
+            # do not block on an abandoned request: agents close their stream
+            # once `cancel` is set, and the request timeout covers deadlines
+            executor.shutdown(wait=False)
+
+    def _run_pytest(self, cwd: str, timeout: Optional[float]) -> subprocess.CompletedProcess:
+        """Run pytest in ``cwd``; the process is terminated on timeout or cancel."""
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pytest", "-q"],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        ends_at = time.monotonic() + timeout if timeout is not None else None
+        try:
+            while True:
+                wait_for = None if self.cancel is None else 0.1
+                if ends_at is not None:
+                    left = max(0.0, ends_at - time.monotonic())
+                    wait_for = left if wait_for is None else min(wait_for, left)
+                try:
+                    stdout, stderr = process.communicate(timeout=wait_for)
+                    return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+                except subprocess.TimeoutExpired:
+                    self._check_cancel()
+                    if ends_at is not None and time.monotonic() >= ends_at:
+                        raise
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.communicate(timeout=2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+
     # helper to run with spinner
-    def _run_step(self, msg: str, func, *args):
-        with Progress(SpinnerColumn(), "[bold blue]" + msg + "...", TimeElapsedColumn(), transient=True) as progress:
-            task = progress.add_task("run")
-            result = func(*args)
-            progress.update(task, completed=1)
+    def _run_step(self, stage: str, msg: str, func, *args, label: Optional[str] = None, checkpoint: bool = True):
+        """Run a pipeline stage, honouring the deadline when one is set.
+
+        Optional stages that do not fit the remaining budget, time out, fail
+        at the API or whose prompt cannot fit (`PromptTooLarge`) raise
+        `_StageSkipped`; required stages propagate errors and
+        raise `DeadlineExceeded` once the deadline has run out.
+        A stage already checkpointed in `run_store` is not executed again.
+        """
+        label = label or stage
+        self._check_cancel()
+        store = self.run_store if checkpoint else None
+        key = self._input_key(stage, label, *args)
+        if store is not None:
+            cached = store.load(label, key)
+            if cached is not None:
+                self._emit("stage_resumed", stage=stage, label=label)
+                self._message(f"↩️ '{label}' aşaması checkpoint'ten alındı.", "notice")
+                return cached
+        optional = stage in OPTIONAL_STAGES
+        timeout: Optional[float] = None
+        if self._deadline is not None:
+            later = self._later_required(stage)
+            if optional and not self._deadline.allows(stage, later):
+                self._drop(label, "kalan süre yetersiz")
+                raise _StageSkipped(label)
+            if not optional and self._deadline.expired:
+                # a zero budget would only surface as a meaningless per-stage timeout
+                raise DeadlineExceeded(self._deadline_message(label))
+            timeout = self._deadline.budget(stage, later)
+        self._stage_agent(stage).request_timeout = timeout
+
+        started = time.monotonic()
+        self._emit("stage_start", stage=stage, label=label, msg=msg)
+        try:
+            if timeout is None and self.cancel is None:
+                result = func(*args)
+            else:
+                result = self._call_with_timeout(func, args, timeout)
+        except FutureTimeout:
+            self._emit("stage_end", stage=stage, label=label, ok=False, seconds=time.monotonic() - started)
+            if optional:
+                self._drop(label, "süre doldu")
+                raise _StageSkipped(label)
+            if self._deadline is not None:
+                raise DeadlineExceeded(self._deadline_message(label))
+            raise RuntimeError(f"'{label}' aşaması süre sınırını aştı")
+        except RuntimeError as exc:
+            self._emit("stage_end", stage=stage, label=label, ok=False, seconds=time.monotonic() - started)
+            # an oversized prompt is skipped even without a deadline: the fixer
+            # must never rewrite code it was only partly shown
+            if optional and (self._deadline is not None or isinstance(exc, PromptTooLarge)):
+                self._drop(label, str(exc))
+                raise _StageSkipped(label) from exc
+            raise
+        elapsed = time.monotonic() - started
+        self._emit("stage_end", stage=stage, label=label, ok=True, seconds=round(elapsed, 3))
+        self._record_latency(stage, elapsed)
+        if store is not None:
+            store.save(label, result, key)
         return result
 
+    def _record_latency(self, stage: str, elapsed: float) -> None:
+        # replayed timings (possibly at --replay-speed 0) would skew the deadline,
+        # hedging and max_tokens estimates of real runs
+        if not self._stage_agent(stage).replaying:
+            self.stats.record(stage, "latency", elapsed)
+
+    def _deadline_message(self, label: str) -> str:
+        return f"Süre sınırı ({self.deadline_seconds:g} sn) aşıldı; '{label}' aşaması tamamlanamadı"
+
+    def _input_key(self, stage: str, label: str, *args) -> str:
+        context = self._stage_agent(stage).context
+        return input_key(label, *((context,) + args if context else args))
+
+    def _split_code(self) -> Optional[str]:
+        """Map-reduce code generation; None means fall back to one CoderAgent call."""
+        try:
+            spec = self._run_step("components", "🧩 Components", self._architect.components, self.prompt)
+        except _StageSkipped:
+            return None
+        components = parse_components(spec)
+        if components is None:
+            self._message("Bileşen listesi kullanılamadı; kod tek parça üretiliyor.", "warning")
+            return None
+        self._emit("artifact", stage="components", content="\n\n".join(c.describe() for c in components))
+
+        try:
+            code = self._strip(
+                self._run_step("code", f"💻 Code ({len(components)} bileşen, paralel)", self._map_components, self.prompt, spec)
+            )
+        except _ComponentsFailed as exc:
+            self._message(f"{exc}; kod tek parça üretiliyor.", "warning")
+            return None
+        issues = check_merged(code, components, self._merge_required)
+        if issues:
+            self._emit("merge_issues", issues=issues)
+            self._message("Birleştirme sorunları:\n" + "\n".join(f"- {i}" for i in issues), "warning")
+        self._merge_issues = issues
+        return code
+
+    def _map_components(self, prompt: str, spec: str) -> str:
+        """Generate every component in parallel and merge them into one module.
+
+        Her bileşen kendi girdi hash'iyle checkpoint'lenir; yarıda kalan bir
+        çalıştırma yalnızca eksik bileşenleri yeniden üretir. Başarısız olan
+        bileşen bir kez tek başına yeniden denenir; yine olmazsa
+        `_ComponentsFailed` ile tek parça üretime dönülür.
+        """
+        components = parse_components(spec) or []
+        overview = "\n\n".join(c.describe() for c in components)
+        self._part_coder.request_timeout = self._coder.request_timeout
+        codes: Dict[str, str] = {}
+        keys = {c.name: self._input_key("component", f"code_{c.name}", prompt, spec, c.name) for c in components}
+        pending = []
+        for component in components:
+            cached = self.run_store.load(f"code_{component.name}", keys[component.name]) if self.run_store else None
+            if cached is not None:
+                codes[component.name] = cached
+            else:
+                pending.append(component)
+
+        def generate(component):
+            started = time.monotonic()
+            code = self._part_coder.run_component(prompt, component, overview)
+            return component, code, time.monotonic() - started
+
+        def finished(component, code, elapsed):
+            codes[component.name] = code
+            self._record_latency("component", elapsed)
+            self._checkpoint(f"code_{component.name}", code, keys[component.name])
+            self._message(f"🧩 '{component.name}' hazır ({elapsed:.1f}s)", "notice")
+
+        failed = []
+        if pending:
+            # one worker per component: wall-clock time follows the slowest part
+            executor = ThreadPoolExecutor(max_workers=len(pending))
+            futures = {executor.submit(generate, c): c for c in pending}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        finished(*future.result())
+                    except Exception as exc:  # noqa: BLE001 - one failed part must not cost the others
+                        failed.append(futures[future])
+                        self._message(f"🧩 '{futures[future].name}' başarısız: {exc}", "warning")
+            finally:
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+        for component in failed:
+            self._check_cancel()
+            try:
+                finished(*generate(component))
+            except Exception as exc:  # noqa: BLE001 - reported as _ComponentsFailed
+                raise _ComponentsFailed(f"'{component.name}' bileşeni üretilemedi ({exc})") from exc
+
+        merged, required = merge_components(components, codes)
+        self._merge_required = sorted(required)
+        return merged
+
+    def _fan_out_review(self, code: str, foci: Sequence[str]) -> str:
+        """Run the focused reviewers side by side and merge their findings."""
+        results: Dict[str, str] = {}
+        failures: List[str] = []
+        executor = ThreadPoolExecutor(max_workers=len(self._focused_reviewers))
+        futures = {}
+        for agent in self._focused_reviewers:
+            agent.request_timeout = self._reviewer.request_timeout
+            futures[executor.submit(agent.run, code)] = agent.focus
+        try:
+            for future in as_completed(futures):
+                focus = futures[future]
+                try:
+                    results[focus] = future.result()
+                except Exception as exc:  # noqa: BLE001 - one failed sub-reviewer must not cost the others' findings
+                    failures.append(focus)
+                    self._message(f"'{focus}' incelemesi başarısız: {exc}", "warning")
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        if not results:
+            raise RuntimeError(f"Tüm alt incelemeler başarısız oldu ({', '.join(failures)})")
+        findings = merge_findings(results)
+        self._emit(
+            "review_findings",
+            reviewers=list(foci),
+            failed=failures,
+            findings=[{"severity": f.severity, "foci": f.foci, "line": f.line, "text": f.text} for f in findings],
+        )
+        return render_findings(findings, [f for f in foci if f in results])
+
+    def _checkpoint(self, label: str, output: str, key: Optional[str] = None) -> None:
+        if self.run_store is not None:
+            self.run_store.save(label, output, key)
+
+    def _learn_fix(
+        self,
+        before: Sequence[Failure],
+        now: Sequence[Failure],
+        code_before: Optional[str],
+        code: str,
+        applied: Sequence[Tuple[str, int]],
+    ) -> None:
+        """Feed the result of the last test-fix round back into the fix memo."""
+        if self.fix_memo is None:
+            return
+        if applied:
+            self.fix_memo.outcome(applied, now)
+        elif code_before is not None and code_before != code:
+            remaining = {f.signature for f in now}
+            gone = [f for f in before if f.signature not in remaining]
+            if gone:
+                self.fix_memo.record(gone, code_before, code)
+
+    def _report_fix_memo(self, before: Optional[dict]) -> None:
+        """Emit this run's fix-memo lookups/hits and the store-wide hit rate."""
+        if self.fix_memo is None or before is None:
+            return
+        after = self.fix_memo.report()
+        delta = {k: after[k] - before[k] for k in ("lookups", "hits", "fixed", "recorded")}
+        if not delta["lookups"] and not delta["recorded"]:
+            return
+        self._emit("fix_memo_report", **delta, hit_rate=after["hit_rate"], fix_rate=after["fix_rate"], entries=after["entries"])
+        self._message(
+            f"🧠 Hata hafızası: {delta['hits']}/{delta['lookups']} imza bilindi, {delta['fixed']} yerelde düzeldi, "
+            f"{delta['recorded']} yeni yama (genel isabet %{after['hit_rate'] * 100:.0f}, {after['entries']} imza).",
+            "notice",
+        )
+
+    def _report_compaction(self) -> None:
+        """Emit the prompt tokens saved by code compaction, per stage."""
+        saved = {s: self._stage_agent(s).tokens_saved for s in self.compact if s in ("review", "tests")}
+        if "review" in saved:
+            saved["review"] += sum(agent.tokens_saved for agent in self._focused_reviewers)
+        if not any(saved.values()):
+            return
+        self._emit("compact_report", tokens_saved=saved, total=sum(saved.values()))
+        detail = ", ".join(f"{stage} −{tokens}" for stage, tokens in saved.items() if tokens)
+        self._message(f"🗜️ Kod sıkıştırma: {detail} token ({sum(saved.values())} toplam).", "notice")
+
+    def _report_hedging(self, before: Optional[dict]) -> None:
+        """Emit this run's share of the failover/hedging counters."""
+        after = endpoint_report()
+        if after is None:
+            return
+        counters = ("calls", "hedges_fired", "hedges_won", "extra_tokens")
+        delta = {k: after[k] - (before[k] if before else 0) for k in counters}
+        self._emit("hedge_report", endpoints=after["endpoints"], **delta)
+        if delta["hedges_fired"]:
+            self._message(
+                f"Hedge: {delta['hedges_fired']}/{delta['calls']} çağrıda tetiklendi, "
+                f"{delta['hedges_won']} kez kazandı, ek maliyet ~{delta['extra_tokens']} token.",
+                "notice",
+            )
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def run(self) -> None:
-        """Execute the requested actions and print results to the console."""
-        console.rule("[bold cyan]Crew Runner Başladı")
+        """Execute the requested actions and emit results to the output backend."""
+        try:
+            if self.run_store is not None:
+                self._emit("checkpoint", run_id=self.run_store.run_id, path=str(self.run_store.dir))
+            return self._run()
+        except StageCancelled:
+            self._emit("cancelled")
+            raise
+        except BaseException:
+            if self.run_store is not None:
+                self._message(
+                    f"Tamamlanan aşamalar kaydedildi. Devam etmek için: --resume {self.run_store.run_id}",
+                    "warning",
+                )
+            raise
+        finally:
+            # one write per run instead of one per recorded sample
+            self.stats.save()
+            if self.fix_memo is not None:
+                self.fix_memo.save()
+            self.output.close()
+
+    def _run(self):
+        self._emit("run_start", prompt=self.prompt, deadline=self.deadline_seconds)
+        endpoints_before = endpoint_report()
+        memo_before = self.fix_memo.report() if self.fix_memo is not None else None
+        self.dropped_stages = []
+        for agent in [self._reviewer, self._tester, self._fixer] + self._focused_reviewers:
+            agent.tokens_saved = 0
+        self._merge_required = []
+        self._merge_issues = []
+        self._deadline = Deadline(self.deadline_seconds, self.stats) if self.deadline_seconds else None
 
         if self.plan_enabled:
-            plan_output = self._run_step("📝 Plan", self._planner.run, self.prompt)
-            console.print(plan_output)
+            try:
+                plan_output = self._run_step("plan", "📝 Plan", self._planner.run, self.prompt)
+                self._emit("artifact", stage="plan", content=plan_output)
+            except _StageSkipped:
+                pass
+
+        try:
+            todo_output = self._run_step("todo", "📋 TODO list", self._todoer.run, self.prompt)
+            self._emit("artifact", stage="todo", content=todo_output)
+            save_todo_markdown(todo_output)
+        except _StageSkipped:
+            pass
+
+        if self.code_override is not None:
+            # hand-edited code replaces the code stage; later stages see new inputs
+            raw_code = self._strip(self.code_override)
+            self._checkpoint("code", raw_code, input_key("code_override", raw_code))
         else:
-            plan_output = ""
-
-        todo_output = self._run_step("📋 TODO list", self._todoer.run, self.prompt)
-        console.print(todo_output)
-        save_todo_markdown(todo_output)
-
-        raw_code = self._run_step("💻 Code", self._coder.run, self.prompt)
-        raw_code = self._strip(raw_code)
-        console.print(raw_code)
-
-        review_notes = self._run_step("🔍 Review", self._reviewer.run, raw_code)
-        console.print(review_notes)
-
-        fixed_code = self._run_step("🛠️ Fix", self._fixer.run, raw_code, review_notes)
-        fixed_code = self._strip(fixed_code)
-        console.print(fixed_code)
+            raw_code = self._split_code() if self.split else None
+            if raw_code is None:
+                raw_code = self._run_step("code", "💻 Code", self._coder.run, self.prompt)
+            raw_code = self._strip(raw_code)
+        self._emit("artifact", stage="code", content=raw_code)
+
+        fixed_code = raw_code
+        try:
+            if self._focused_reviewers:
+                review_notes = self._run_step(
+                    "review", f"🔍 Review ({', '.join(self.reviewers)})", self._fan_out_review, raw_code, self.reviewers
+                )
+            else:
+                review_notes = self._run_step("review", "🔍 Review", self._reviewer.run, raw_code)
+            self._emit("artifact", stage="review", content=review_notes)
+        except _StageSkipped:
+            review_notes = None
+        if self._merge_issues:
+            # the fixer also resolves inconsistencies found while merging components
+            merge_notes = "Bileşen birleştirme sorunları:\n" + "\n".join(f"- {i}" for i in self._merge_issues)
+            review_notes = merge_notes if review_notes is None else f"{merge_notes}\n\n{review_notes}"
+        if review_notes is None:
+            # fix only makes sense with review notes
+            self._drop("fix", "inceleme notu yok")
+
+        if review_notes is not None:
+            try:
+                fixed_code = self._run_step("fix", "🛠️ Fix", self._fixer.run, raw_code, review_notes)
+                fixed_code = self._strip(fixed_code)
+                self._emit("artifact", stage="fix", content=fixed_code)
+            except _StageSkipped:
+                fixed_code = raw_code
 
         # -----------------------------------------------------------------
         # Testing phase
         # -----------------------------------------------------------------
-        test_code_raw = self._run_step("🧪 Tests", self._tester.run, fixed_code)
+        test_code_raw = self._run_step("tests", "🧪 Tests", self._tester.run, fixed_code)
         test_code = self._strip(test_code_raw)
 
-        console.print(test_code)
+        self._emit("artifact", stage="tests", content=test_code)
+
+        loop_key = input_key("test_fix", fixed_code, test_code)
+        if self.run_store is not None:
+            # resume the test loop from the last code it produced for these inputs
+            fixed_code = self._strip(self.run_store.load("test_fix", loop_key) or fixed_code)
 
         # run tests with up to 3 attempts
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -136,57 +650,128 @@ class CrewRunner:
                 main_path.write_text(fixed_code, encoding="utf-8")
                 test_path.write_text(test_code, encoding="utf-8")
             except IOError as e:
-                console.print(f"[red]Dosya yazma hatası: {e}")
+                self._message(f"Dosya yazma hatası: {e}", "error")
                 raise
 
             attempts = 0
+            passed = False
+            cut_short = False
+            # fix-memo bookkeeping for the round that produced the current code
+            last_failures: List[Failure] = []
+            code_before_fix: Optional[str] = None
+            memo_applied: List[Tuple[str, int]] = []
+            memo_tried: Set[str] = set()
             while attempts < 3:
-                result = subprocess.run([sys.executable, "-m", "pytest", "-q"], cwd=tmpdir, capture_output=True, text=True)
+                self._check_cancel()
+                run_timeout = self._deadline.remaining() if self._deadline is not None else None
+                try:
+                    result = self._run_pytest(tmpdir, run_timeout)
+                except subprocess.TimeoutExpired:
+                    self._drop("test_run", "süre doldu")
+                    cut_short = True
+                    break
 
-                if result.returncode == 0:
-                    console.print("[bold green]✅ Birim testleri geçti.")
+                passed = result.returncode == 0
+                failures = [] if passed else parse_failures(result.stdout + result.stderr)
+                self._learn_fix(last_failures, failures, code_before_fix, fixed_code, memo_applied)
+                code_before_fix, memo_applied = None, []
+                self._emit("test_result", attempt=attempts + 1, passed=passed)
+                if passed:
+                    self._message("✅ Birim testleri geçti.", "success")
                     break
 
-                console.print("[red]❌ Birim testleri başarısız oldu.")
-                console.print(result.stdout + result.stderr)
+                self._message("❌ Birim testleri başarısız oldu.", "error")
+                self._emit("artifact", stage="test_output", content=result.stdout + result.stderr)
 
-                choice = click.prompt(
-                    "Ne yapmak istersiniz? [a]utomatik düzelt / [m]anuel düzelt / [q]uit",
-                    type=click.Choice(["a", "m", "q"], case_sensitive=False),
-                    default="a",
-                )
+                if self._deadline is not None or not self.output.interactive:
+                    # no one to answer questions under a deadline or headless
+                    choice = "a"
+                else:
+                    choice = click.prompt(
+                        "Ne yapmak istersiniz? [a]utomatik düzelt / [m]anuel düzelt / [q]uit",
+                        type=click.Choice(["a", "m", "q"], case_sensitive=False),
+                        default="a",
+                    )
 
                 if choice == "q":
-                    console.print("[yellow]Çıkış yapılıyor.")
+                    self._message("Çıkış yapılıyor.", "warning")
                     raise SystemExit(1)
 
+                if choice == "a" and self.fix_memo is not None:
+                    patched, applied = self.fix_memo.lookup(failures, fixed_code, skip=memo_tried)
+                    if patched is not None:
+                        # known failure: patch locally and re-run without spending an attempt
+                        memo_tried.update(signature for signature, _ in applied)
+                        known = [f.describe() for f in failures if f.signature in memo_tried]
+                        self._message(f"🧠 Bilinen hata yerelde düzeltildi: {'; '.join(known)}", "notice")
+                        last_failures, memo_applied = failures, applied
+                        fixed_code = patched
+                        self._checkpoint("test_fix", fixed_code, loop_key)
+                        self._emit("artifact", stage="fix", content=fixed_code)
+                        main_path.write_text(fixed_code, encoding="utf-8")
+                        continue
+
+                code_before_fix, last_failures = fixed_code, failures
                 if choice == "a":
-                    console.print("[cyan]🤖 Fixer otomatik düzeltme uyguluyor...")
-                    fixed_code = self._fixer.run(fixed_code, result.stdout + result.stderr)
+                    self._message("🤖 Fixer otomatik düzeltme uyguluyor...", "notice")
+                    try:
+                        fixed_code = self._run_step(
+                            "fix",
+                            "🛠️ Fix",
+                            self._fixer.run,
+                            fixed_code,
+                            result.stdout + result.stderr,
+                            label=f"test_fix_{attempts + 1}",
+                            checkpoint=False,
+                        )
+                    except _StageSkipped:
+                        cut_short = True
+                        break
                     fixed_code = self._strip(fixed_code)
-                    console.print(fixed_code)
+                    self._checkpoint("test_fix", fixed_code, loop_key)
+                    self._emit("artifact", stage="fix", content=fixed_code)
                     main_path.write_text(fixed_code, encoding="utf-8")
                 else:  # manuel
-                    console.print(f"[blue]Kod dosyası: {main_path}")
-                    console.print("Hata detaylarını yukarıda görebilirsiniz. Düzenlemeyi kaydedip Enter'e basın.")
+                    self._message(f"Kod dosyası: {main_path}", "notice")
+                    self._message("Hata detaylarını yukarıda görebilirsiniz. Düzenlemeyi kaydedip Enter'e basın.")
                     click.prompt("Devam etmek için Enter", default="", show_default=False)
                     fixed_code = main_path.read_text(encoding="utf-8")
+                    self._checkpoint("test_fix", fixed_code, loop_key)
 
                 attempts += 1
 
-            if attempts == 3 and result.returncode != 0:
-                console.print(
-                    "[bold red]Testler 3 denemede de geçmedi. Daha fazla yardım için destekle iletişime geçin veya Manuel olarak düzeltin."
+            if cut_short and not passed:
+                self._message(
+                    f"'{self.dropped_stages[-1]}' atlandığı için testler geçmeden sonuç döndürülüyor.", "warning"
+                )
+            elif attempts == 3 and not passed:
+                self._message(
+                    "Testler 3 denemede de geçmedi. Daha fazla yardım için destekle iletişime geçin veya Manuel olarak düzeltin.",
+                    "error",
                 )
                 raise RuntimeError("Tests failed after 3 attempts")
 
         if self.explicit_save:
             write_text_to_file(self.save_path, self._strip(fixed_code))
-            console.print(f"[bold green]Code saved to {self.save_path}.")
+            self._message(f"Code saved to {self.save_path}.", "success")
         else:
-            console.print(f"[yellow]Code not saved yet. Suggested file: {self.save_path}")
-
-        console.rule("[bold cyan]Crew Runner completed")
+            self._message(f"Code not saved yet. Suggested file: {self.save_path}", "warning")
+
+        if self.dropped_stages:
+            self._message(f"Atlanan/kısaltılan aşamalar: {', '.join(self.dropped_stages)}", "warning")
+
+        self._report_hedging(endpoints_before)
+        self._report_compaction()
+        self._report_fix_memo(memo_before)
+        self._emit(
+            "result",
+            code=fixed_code,
+            save_path=self.save_path,
+            saved=self.explicit_save,
+            tests_passed=passed,
+            dropped_stages=list(self.dropped_stages),
+        )
+        self._emit("run_end")
 
         # return fixed code and suggested path so that CLI can decide to save
-        return fixed_code, self.save_path 
\ No newline at end of file
+        return fixed_code, self.save_path
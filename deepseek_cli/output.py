@@ -0,0 +1,204 @@
+"""Output backends for CrewRunner events.
+
+CrewRunner does not print anything itself; it emits events such as
+``stage_start``, ``artifact`` or ``result`` and the selected backend decides
+how (and whether) they are rendered:
+
+* ``RichOutput``      → mevcut Rich arayüzü (spinner + tüm çıktılar)
+* ``ThrottledOutput`` → tek bir Live görünümü, sabit hızda yenilenir
+* ``JsonOutput``      → render yok; NDJSON satırları ya da tek bir JSON belgesi
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, TextIO, Tuple
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
+from rich.text import Text
+
+
+_LEVEL_STYLES = {
+    "info": "",
+    "success": "bold green",
+    "warning": "yellow",
+    "error": "red",
+    "notice": "cyan",
+}
+
+
+class OutputBackend(abc.ABC):
+    """Receives CrewRunner events."""
+
+    # False for headless backends; CrewRunner then never asks questions
+    interactive: bool = True
+
+    @abc.abstractmethod
+    def emit(self, event: str, **data: Any) -> None:
+        """Handle a single event."""
+
+    def close(self) -> None:
+        """Flush pending output at the end of a run."""
+
+
+class RichOutput(OutputBackend):
+    """The classic UI: one spinner per stage and every artifact printed in full."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+        self._progress: Optional[Progress] = None
+
+    def emit(self, event: str, **data: Any) -> None:
+        if event == "run_start":
+            self.console.rule("[bold cyan]Crew Runner Başladı")
+        elif event == "stage_start":
+            self._progress = Progress(
+                SpinnerColumn(), "[bold blue]" + data["msg"] + "...", TimeElapsedColumn(), transient=True
+            )
+            self._progress.start()
+            self._progress.add_task("run")
+        elif event == "stage_end":
+            if self._progress is not None:
+                self._progress.stop()
+                self._progress = None
+        elif event == "artifact":
+            self.console.print(data["content"])
+        elif event == "message":
+            # message text may be an exception string; never parse it as markup
+            self.console.print(Text(data["text"], style=_LEVEL_STYLES.get(data.get("level", "info"), "")))
+        elif event == "run_end":
+            self.console.rule("[bold cyan]Crew Runner completed")
+
+    def close(self) -> None:
+        if self._progress is not None:
+            self._progress.stop()
+            self._progress = None
+
+
+class _LiveState:
+    """Renderable read by ``Live`` on each refresh; events only mutate it."""
+
+    def __init__(self, tail_lines: int) -> None:
+        self.stage: Optional[str] = None
+        self.stage_started = 0.0
+        # (label, ok) of finished stages
+        self.done: List[Tuple[str, bool]] = []
+        self.messages: Deque[Text] = deque(maxlen=5)
+        self.artifact: Deque[str] = deque(maxlen=tail_lines)
+
+    def __rich__(self) -> Group:
+        parts: List[Any] = []
+        if self.done:
+            line = Text()
+            for index, (label, ok) in enumerate(self.done):
+                if index:
+                    line.append("  ")
+                line.append(f"✔ {label}" if ok else f"✘ {label}", style="green" if ok else "red")
+            parts.append(line)
+        if self.stage:
+            elapsed = time.monotonic() - self.stage_started
+            parts.append(Text(f"⏳ {self.stage} ({elapsed:.1f}s)", style="bold blue"))
+        if self.artifact:
+            parts.append(Text("\n".join(self.artifact), style="dim"))
+        parts.extend(self.messages)
+        return Group(*parts)
+
+
+class ThrottledOutput(OutputBackend):
+    """Single Live view refreshed at a fixed rate instead of printing every event.
+
+    Only the last ``tail_lines`` lines of the latest artifact are kept, so the
+    cost per refresh is constant no matter how large the outputs are.
+    """
+
+    def __init__(self, refresh_per_second: float = 4, tail_lines: int = 12, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+        self.refresh_per_second = refresh_per_second
+        self._state = _LiveState(tail_lines)
+        self._live: Optional[Live] = None
+        self._final: List[Text] = []
+
+    def emit(self, event: str, **data: Any) -> None:
+        state = self._state
+        if event == "run_start" and self._live is None:
+            self._live = Live(
+                state,
+                console=self.console,
+                refresh_per_second=self.refresh_per_second,
+                transient=True,
+            )
+            self._live.start()
+        elif event == "stage_start":
+            state.stage = data["msg"]
+            state.stage_started = time.monotonic()
+        elif event == "stage_end":
+            state.done.append((data["label"], data.get("ok", True)))
+            state.stage = None
+        elif event == "artifact":
+            state.artifact.clear()
+            # splitting only the tail keeps large artifacts cheap
+            state.artifact.extend(data["content"][-4000:].splitlines())
+        elif event == "message":
+            line = Text(data["text"], style=_LEVEL_STYLES.get(data.get("level", "info"), ""))
+            state.messages.append(line)
+            if data.get("level") in {"success", "warning", "error"}:
+                self._final.append(line)
+        elif event == "run_end":
+            self.close()
+
+    def close(self) -> None:
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+            for line in self._final:
+                self.console.print(line)
+            self._final = []
+
+
+class JsonOutput(OutputBackend):
+    """Machine-readable output without any rendering.
+
+    ``ndjson=True`` writes one JSON object per event as it happens; otherwise
+    all events are collected and written as a single document on ``close``.
+    """
+
+    interactive = False
+
+    def __init__(self, stream: Optional[TextIO] = None, ndjson: bool = True) -> None:
+        self.stream = stream or sys.stdout
+        self.ndjson = ndjson
+        self._events: List[Dict[str, Any]] = []
+
+    def emit(self, event: str, **data: Any) -> None:
+        record = {"event": event, "ts": round(time.time(), 3), **data}
+        if self.ndjson:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+        else:
+            self._events.append(record)
+
+    def close(self) -> None:
+        if not self.ndjson and self._events:
+            self.stream.write(json.dumps({"events": self._events}, ensure_ascii=False) + "\n")
+            self.stream.flush()
+            self._events = []
+
+
+OUTPUT_MODES = ("rich", "live", "json", "ndjson")
+
+
+def make_output(mode: str = "rich") -> OutputBackend:
+    """Return the backend for a CLI ``--output`` value."""
+    if mode == "rich":
+        return RichOutput()
+    if mode == "live":
+        return ThrottledOutput()
+    if mode in {"json", "ndjson"}:
+        return JsonOutput(ndjson=mode == "ndjson")
+    raise ValueError(f"Bilinmeyen çıktı modu: {mode}")
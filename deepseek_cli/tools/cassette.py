@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Sequence, Union
+
+
+class CassetteMiss(RuntimeError):
+    """Raised in replay mode when no recorded response matches a request."""
+
+
+def request_key(model: str, messages: Sequence[Dict[str, str]]) -> str:
+    """Stable hash of the request.
+
+    ``max_tokens`` is left out on purpose: it follows the persisted output
+    history and would differ between recording and replay.
+    """
+    payload = json.dumps([model, list(messages)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+class Cassette:
+    """Record/replay store for chat completions.
+
+    Dosya biçimi: her satırda bir kayıt olan JSON Lines; yol ``.gz`` ile
+    bitiyorsa gzip ile sıkıştırılır. Kayıt alanları kısa tutulur:
+
+    ``k`` istek hash'i, ``s`` aşama, ``q`` mesajlar, ``r`` yanıt,
+    ``t`` toplam süre (sn), ``u`` çıktı token sayısı, ``c`` stream parça
+    zamanları (isteğe bağlı, sn cinsinden offset listesi).
+
+    ``speed`` replay sırasında gecikmeleri ölçekler: 1.0 orijinal süre,
+    0.1 on kat hızlı, 0 beklemesiz.
+
+    Kayıt modunda mevcut dosya ancak ilk kayıt yazılırken sıfırlanır; replay
+    modunda birebir eşleşmeyen istek `CassetteMiss` yükseltir.
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        speed: float = 1.0,
+        stream_chunks: bool = False,
+        sleep=time.sleep,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz cassette modu: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        # record mode only: stream responses to capture per-chunk timings
+        self.stream_chunks = stream_chunks
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._used: List[bool] = []
+        # record mode: the old recording is replaced on the first write only
+        self._started = False
+        if mode == "replay":
+            self._entries = self._read()
+            self._used = [False] * len(self._entries)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # ------------------------------------------------------------------
+    # file helpers
+    # ------------------------------------------------------------------
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+        return self.path.open(mode, encoding="utf-8")
+
+    def _read(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette bulunamadı: {self.path}")
+        with self._open("r") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+    # ------------------------------------------------------------------
+    # record / replay
+    # ------------------------------------------------------------------
+    def record(
+        self,
+        stage: str,
+        key: str,
+        messages: Sequence[Dict[str, str]],
+        response: str,
+        latency: float,
+        output_tokens: Optional[int] = None,
+        chunks: Optional[List[float]] = None,
+    ) -> None:
+        entry: Dict[str, Any] = {
+            "k": key,
+            "s": stage,
+            "q": list(messages),
+            "r": response,
+            "t": round(latency, 3),
+        }
+        if output_tokens is not None:
+            entry["u"] = output_tokens
+        if chunks:
+            entry["c"] = [round(c, 3) for c in chunks]
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if not self._started:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            # appended right away so an interrupted run still leaves a usable cassette
+            with self._open("a" if self._started else "w") as fh:
+                fh.write(line)
+            self._started = True
+
+    def _take(self, stage: str, key: str) -> Dict[str, Any]:
+        with self._lock:
+            # the next unused recording of this exact request; a request sent
+            # more often than recorded gets the last answer again
+            for index, entry in enumerate(self._entries):
+                if not self._used[index] and entry["k"] == key:
+                    self._used[index] = True
+                    return entry
+            for entry in reversed(self._entries):
+                if entry["k"] == key:
+                    return entry
+        raise CassetteMiss(
+            f"Cassette içinde '{stage}' isteği için birebir kayıt yok ({key}); "
+            f"prompt kayıttan sonra değişmiş olabilir, cassette'i yeniden kaydedin"
+        )
+
+    def replay(self, stage: str, key: str) -> Dict[str, Any]:
+        """Return the recorded entry after waiting its (scaled) latency."""
+        entry = self._take(stage, key)
+        if self.speed > 0:
+            chunks = entry.get("c")
+            if chunks:
+                # reproduce the original pacing chunk by chunk
+                previous = 0.0
+                for offset in chunks:
+                    self._sleep(max(0.0, offset - previous) * self.speed)
+                    previous = offset
+                self._sleep(max(0.0, entry["t"] - previous) * self.speed)
+            else:
+                self._sleep(entry["t"] * self.speed)
+        return entry
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import secrets
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .file_tools import write_text_atomic
+
+
+RUNS_DIRNAME = ".deepseek_runs"
+MANIFEST = "manifest.json"
+
+
+def default_runs_root() -> Path:
+    return Path.cwd() / RUNS_DIRNAME
+
+
+def input_key(stage: str, *inputs: Any) -> str:
+    """Hash of a stage's exact inputs, used to decide whether it must re-run."""
+    payload = json.dumps([stage, list(inputs)], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+
+class RunStore:
+    """Per-run directory holding one checkpoint file per finished stage.
+
+    Dizin yapısı::
+
+        .deepseek_runs/<RUN_ID>/
+            manifest.json   # prompt, seçenekler, tamamlanan aşamalar
+            prompt.txt      # düzenlenebilir istek metni
+            code.txt, review.txt, ...
+            memo/<stage>-<hash>.txt   # girdi hash'ine göre önceki çıktılar
+
+    Aşama dosyaları düz metindir; kullanıcı bir dosyayı düzenleyip
+    `--resume RUN_ID --from-stage <sonraki aşama>` ile devam edebilir.
+    Her yazım atomiktir, süreç öldürülse bile yarım dosya kalmaz.
+
+    Bir aşama girdi hash'i (`input_key`) ile kaydedildiyse yalnızca aynı
+    girdilerle tekrar istendiğinde geri verilir; girdisi değişen aşama ve
+    ondan sonrakiler kendiliğinden yeniden çalışır.
+    """
+
+    def __init__(self, run_id: str, root: Union[str, Path, None] = None) -> None:
+        self.run_id = run_id
+        self.root = Path(root) if root is not None else default_runs_root()
+        self.dir = self.root / run_id
+        self._manifest: Dict[str, Any] = {"run_id": run_id, "meta": {}, "completed": [], "keys": {}}
+        if (self.dir / MANIFEST).exists():
+            self._manifest = json.loads((self.dir / MANIFEST).read_text(encoding="utf-8"))
+            self._manifest.setdefault("keys", {})
+        # watch mode saves from a worker thread while the main thread reads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, prompt: str, meta: Optional[Dict[str, Any]] = None, root: Union[str, Path, None] = None) -> "RunStore":
+        run_id = time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+        store = cls(run_id, root)
+        store._manifest["meta"] = dict(meta or {})
+        write_text_atomic(store.dir / "prompt.txt", prompt)
+        store._write_manifest()
+        return store
+
+    @classmethod
+    def open(cls, run_id: str, root: Union[str, Path, None] = None) -> "RunStore":
+        store = cls(run_id, root)
+        if not (store.dir / MANIFEST).exists():
+            raise FileNotFoundError(f"Run bulunamadı: {store.dir}")
+        return store
+
+    def remove(self) -> None:
+        """Delete the run directory, and the runs root if nothing else is left in it.
+
+        Resume only matters for failed or killed runs; a finished run would
+        otherwise leave its checkpoints in the user's project for good.
+        """
+        with self._lock:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            try:
+                self.root.rmdir()
+            except OSError:
+                pass
+
+    def _write_manifest(self) -> None:
+        write_text_atomic(self.dir / MANIFEST, json.dumps(self._manifest, ensure_ascii=False, indent=2))
+
+    # ------------------------------------------------------------------
+    @property
+    def prompt(self) -> str:
+        return (self.dir / "prompt.txt").read_text(encoding="utf-8")
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self._manifest["meta"]
+
+    @property
+    def completed(self) -> List[str]:
+        return list(self._manifest["completed"])
+
+    def has(self, stage: str) -> bool:
+        return stage in self._manifest["completed"] and (self.dir / f"{stage}.txt").exists()
+
+    def _memo_path(self, stage: str, key: str) -> Path:
+        return self.dir / "memo" / f"{stage}-{key}.txt"
+
+    def load(self, stage: str, key: Optional[str] = None) -> Optional[str]:
+        """Return the stored output of ``stage``.
+
+        With ``key`` the current checkpoint is only used if it was produced
+        from the same inputs (its file may have been edited by hand); other
+        earlier results are looked up in the memo directory.
+        """
+        with self._lock:
+            recorded = self._manifest["keys"].get(stage)
+            if self.has(stage) and (key is None or recorded is None or recorded == key):
+                return (self.dir / f"{stage}.txt").read_text(encoding="utf-8")
+            if key is not None and self._memo_path(stage, key).exists():
+                return self._memo_path(stage, key).read_text(encoding="utf-8")
+            return None
+
+    def save(self, stage: str, output: str, key: Optional[str] = None) -> None:
+        """Checkpoint ``stage``: output file first, then the manifest entry."""
+        with self._lock:
+            write_text_atomic(self.dir / f"{stage}.txt", output)
+            if key is not None:
+                write_text_atomic(self._memo_path(stage, key), output)
+                self._manifest["keys"][stage] = key
+            else:
+                self._manifest["keys"].pop(stage, None)
+            if stage not in self._manifest["completed"]:
+                self._manifest["completed"].append(stage)
+            self._write_manifest()
+
+    def discard_from(self, stage: str, order: Sequence[str]) -> None:
+        """Forget ``stage`` and every stage after it in ``order`` (files are kept as *.bak).
+
+        Sub-checkpoints named ``<stage>_<part>`` (e.g. ``code_models``) go with
+        their stage.
+        """
+        later = set(order[order.index(stage):])
+
+        def belongs(name: str) -> bool:
+            return any(name == s or name.startswith(s + "_") for s in later)
+
+        for name in list(self._manifest["completed"]):
+            if belongs(name):
+                self._manifest["completed"].remove(name)
+                self._manifest["keys"].pop(name, None)
+                path = self.dir / f"{name}.txt"
+                if path.exists():
+                    shutil.move(str(path), str(path.with_suffix(".txt.bak")))
+        # memoized results would otherwise bring the discarded stages back
+        for memo in (self.dir / "memo").glob("*.txt"):
+            if belongs(memo.stem.rsplit("-", 1)[0]):
+                memo.unlink()
+        self._write_manifest()
@@ -0,0 +1,235 @@
+"""Component specs for map-reduce code generation and the local merge step.
+
+PlannerAgent büyük bir isteği bileşenlere böler (JSON), her bileşen ayrı bir
+CoderAgent çağrısıyla paralel üretilir ve burada tek bir modülde
+birleştirilir. Birleştirme importları tekilleştirir, kardeş bileşenlerden
+yapılan importları kaldırır (hepsi aynı dosyada) ve bildirilen arayüzlerin
+gerçekten tanımlandığını, imzaların tuttuğunu denetler.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+# more parts than this costs more in merge problems than it saves in latency
+MAX_COMPONENTS = 8
+
+_IDENT_RE = re.compile(r"[^0-9A-Za-z_]+")
+
+
+class Component:
+    """One independently generated part of the program."""
+
+    def __init__(self, name: str, purpose: str = "", interface: Sequence[str] = (), depends_on: Sequence[str] = ()) -> None:
+        self.name = name
+        self.purpose = purpose
+        self.interface = list(interface)
+        self.depends_on = list(depends_on)
+
+    def describe(self) -> str:
+        lines = [f"### {self.name}", self.purpose]
+        lines.extend(f"    {sig}" for sig in self.interface)
+        if self.depends_on:
+            lines.append(f"  (kullanır: {', '.join(self.depends_on)})")
+        return "\n".join(line for line in lines if line)
+
+
+def _slug(name: str) -> str:
+    return _IDENT_RE.sub("_", name.strip()).strip("_").lower() or "part"
+
+
+def parse_components(text: str) -> Optional[List[Component]]:
+    """Parse the planner's JSON answer; None if it is unusable or not worth splitting."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    items = data.get("components") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return None
+
+    components: List[Component] = []
+    seen: Set[str] = set()
+    for item in items[:MAX_COMPONENTS]:
+        if not isinstance(item, dict) or not item.get("name"):
+            continue
+        name = _slug(str(item["name"]))
+        if name in seen:
+            continue
+        seen.add(name)
+        interface = item.get("interface") or []
+        depends = item.get("depends_on") or []
+        components.append(
+            Component(
+                name,
+                str(item.get("purpose", "")),
+                [str(s) for s in interface] if isinstance(interface, list) else [str(interface)],
+                [_slug(str(d)) for d in depends] if isinstance(depends, list) else [],
+            )
+        )
+    for component in components:
+        component.depends_on = [d for d in component.depends_on if d in seen and d != component.name]
+    # a single component is just the normal one-shot generation
+    return components if len(components) >= 2 else None
+
+
+def dependency_order(components: Sequence[Component]) -> List[Component]:
+    """Topological order (dependencies first); cycles keep the planner's order."""
+    by_name = {c.name: c for c in components}
+    ordered: List[Component] = []
+    state: Dict[str, int] = {}
+
+    def visit(component: Component) -> None:
+        if state.get(component.name):
+            return
+        state[component.name] = 1
+        for dep in component.depends_on:
+            visit(by_name[dep])
+        state[component.name] = 2
+        ordered.append(component)
+
+    for component in components:
+        visit(component)
+    return ordered
+
+
+def _strip_fences(code: str) -> str:
+    code = re.sub(r"^```(?:\w+)?\s*\n?", "", code.strip())
+    return re.sub(r"\n?```$", "", code).strip()
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+    )
+
+
+def merge_components(components: Sequence[Component], codes: Dict[str, str]) -> Tuple[str, Set[str]]:
+    """Combine the generated parts into one module.
+
+    Returns the merged source and the names the parts imported from each
+    other; those must be defined somewhere in the merged module.
+    """
+    siblings = {c.name for c in components}
+    imports: List[str] = []
+    seen_imports: Set[str] = set()
+    bodies: List[str] = []
+    required: Set[str] = set()
+    main_guard: Optional[str] = None
+
+    for component in dependency_order(components):
+        source = _strip_fences(codes.get(component.name, ""))
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            # keep it verbatim; check_merged reports the syntax error
+            bodies.append(f"# --- {component.name} ---\n{source}")
+            continue
+        lines = source.splitlines()
+        kept: List[str] = []
+        for node in tree.body:
+            decorators = getattr(node, "decorator_list", None)
+            first = decorators[0].lineno if decorators else node.lineno
+            segment = "\n".join(lines[first - 1:node.end_lineno])  # type: ignore[attr-defined]
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                module = node.module if isinstance(node, ast.ImportFrom) else None
+                names = [a.name.split(".")[0] for a in node.names]
+                root = (module or "").split(".")[0]
+                if isinstance(node, ast.ImportFrom) and (node.level or root in siblings):
+                    # everything lives in one file now
+                    required.update(a.asname or a.name for a in node.names if a.name != "*")
+                    continue
+                if isinstance(node, ast.Import) and all(n in siblings for n in names):
+                    # "module.name" access cannot work in a single file
+                    required.update(names)
+                    continue
+                normalized = " ".join(segment.split())
+                if normalized not in seen_imports:
+                    seen_imports.add(normalized)
+                    imports.append(segment)
+            elif _is_main_guard(node):
+                # only one entry point survives: the last one in dependency order
+                main_guard = segment
+            else:
+                kept.append(segment)
+        if kept:
+            bodies.append(f"# --- {component.name} ---\n" + "\n\n".join(kept))
+
+    future = [i for i in imports if i.startswith("from __future__")]
+    others = [i for i in imports if not i.startswith("from __future__")]
+    parts = ["\n".join(future + others)] if imports else []
+    parts.extend(bodies)
+    if main_guard:
+        parts.append(main_guard)
+    return "\n\n\n".join(parts) + "\n", required
+
+
+def _params(node: ast.AST) -> List[str]:
+    args = node.args  # type: ignore[attr-defined]
+    names = [a.arg for a in args.posonlyargs + args.args + args.kwonlyargs]
+    return [n for n in names if n not in {"self", "cls"}]
+
+
+def _interface_node(signature: str) -> Optional[ast.AST]:
+    text = signature.strip().rstrip(":")
+    for candidate in (text + ":\n    pass", text):
+        try:
+            tree = ast.parse(candidate)
+        except SyntaxError:
+            continue
+        if tree.body:
+            return tree.body[0]
+    return None
+
+
+def check_merged(code: str, components: Sequence[Component], required: Sequence[str] = ()) -> List[str]:
+    """Return human readable problems of the merged module (empty if consistent)."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as exc:
+        return [f"Birleştirilmiş kod derlenmiyor: satır {exc.lineno}: {exc.msg}"]
+
+    issues: List[str] = []
+    defined: Dict[str, ast.AST] = {}
+    for node in tree.body:
+        names: List[str] = []
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names = [node.name]
+            if node.name in defined:
+                issues.append(f"'{node.name}' birden fazla bileşende tanımlanmış")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [t.id for t in targets if isinstance(t, ast.Name)]
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [(a.asname or a.name).split(".")[0] for a in node.names]
+        for name in names:
+            defined.setdefault(name, node)
+
+    for component in components:
+        for signature in component.interface:
+            expected = _interface_node(signature)
+            if isinstance(expected, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                actual = defined.get(expected.name)
+                if actual is None:
+                    issues.append(f"{component.name}: arayüzdeki '{expected.name}' tanımlanmamış")
+                elif isinstance(expected, ast.ClassDef) != isinstance(actual, ast.ClassDef):
+                    issues.append(f"{component.name}: '{expected.name}' türü arayüzle uyuşmuyor")
+                elif not isinstance(expected, ast.ClassDef) and isinstance(actual, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    if _params(expected) != _params(actual):
+                        issues.append(
+                            f"{component.name}: '{expected.name}' imzası arayüzle uyuşmuyor "
+                            f"({', '.join(_params(actual))} ≠ {', '.join(_params(expected))})"
+                        )
+    for name in sorted(set(required) - set(defined)):
+        issues.append(f"'{name}' başka bir bileşenden import ediliyor ama hiçbir bileşende yok")
+    return issues
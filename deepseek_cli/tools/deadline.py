@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from .stage_stats import StageStats
+
+
+# history yokken kullanılan kaba aşama süresi tahminleri (saniye)
+DEFAULT_STAGE_ESTIMATES: Dict[str, float] = {
+    "plan": 15.0,
+    "todo": 10.0,
+    "code": 40.0,
+    "review": 25.0,
+    "fix": 40.0,
+    "tests": 30.0,
+    # map-reduce code generation (--split)
+    "components": 15.0,
+    "component": 30.0,
+}
+
+# stages that can be skipped or cut short to meet a deadline
+# ("components" falls back to one-shot code generation)
+OPTIONAL_STAGES = frozenset({"plan", "todo", "review", "fix", "components"})
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a required stage cannot run or finish inside the deadline."""
+
+
+class Deadline:
+    """Wall-clock budget shared by all stages of a single CrewRunner run."""
+
+    def __init__(
+        self,
+        seconds: float,
+        stats: Optional[StageStats] = None,
+        quantile: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.seconds = seconds
+        self.stats = stats
+        self.quantile = quantile
+        self._clock = clock
+        self._end = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._end - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def estimate(self, stage: str) -> float:
+        """Expected latency of ``stage`` based on recorded history."""
+        default = DEFAULT_STAGE_ESTIMATES.get(stage, 30.0)
+        if self.stats is None:
+            return default
+        return self.stats.percentile(stage, "latency", self.quantile, default)  # type: ignore[return-value]
+
+    def budget(self, stage: str, later_required: Iterable[str] = ()) -> float:
+        """Time ``stage`` may use while keeping room for the required stages after it."""
+        reserve = sum(self.estimate(s) for s in later_required)
+        remaining = self.remaining()
+        if stage in OPTIONAL_STAGES:
+            return max(0.0, remaining - reserve)
+        # required stages never give up their turn; the reserve only applies
+        # while there is actually time left to hand out
+        return remaining - reserve if remaining > reserve else remaining
+
+    def allows(self, stage: str, later_required: Iterable[str] = ()) -> bool:
+        """True if ``stage`` is expected to finish inside its budget."""
+        return self.estimate(stage) <= self.budget(stage, later_required)
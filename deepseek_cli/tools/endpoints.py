@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class Endpoint:
+    """One API base URL + key pair and its health state."""
+
+    def __init__(self, base_url: str, api_key: str) -> None:
+        self.base_url = base_url
+        self.api_key = api_key
+        self.failures = 0
+        self.down_until = 0.0
+        self.latency: Optional[float] = None  # EWMA of successful calls
+        # OpenAI client, created lazily by the agent layer
+        self.client: Any = None
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+
+class EndpointPool:
+    """Health-ordered endpoints plus hedging counters.
+
+    Bir uç nokta art arda ``max_failures`` kez hata verirse ``cooldown``
+    saniye boyunca sona alınır; her yeni düşüşte süre iki katına çıkar.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        max_failures: int = 2,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("En az bir API uç noktası gerekli")
+        self.endpoints = list(endpoints)
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.extra_tokens = 0
+
+    @classmethod
+    def from_lists(cls, bases: Sequence[str], keys: Sequence[str], **kwargs: Any) -> "EndpointPool":
+        """Pair every base URL with a key; a single key is shared by all bases."""
+        if not keys:
+            keys = [""]
+        endpoints = [Endpoint(base, keys[i] if i < len(keys) else keys[-1]) for i, base in enumerate(bases)]
+        return cls(endpoints, **kwargs)
+
+    def ordered(self) -> List[Endpoint]:
+        """Healthy endpoints first (fewest failures, then fastest), then the rest."""
+        now = self._clock()
+        with self._lock:
+            return sorted(
+                self.endpoints,
+                key=lambda e: (
+                    not e.healthy(now),
+                    e.failures,
+                    e.latency if e.latency is not None else float("inf"),
+                ),
+            )
+
+    def mark_success(self, endpoint: Endpoint, latency: float) -> None:
+        with self._lock:
+            endpoint.failures = 0
+            endpoint.down_until = 0.0
+            endpoint.latency = latency if endpoint.latency is None else 0.8 * endpoint.latency + 0.2 * latency
+
+    def mark_failure(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.failures += 1
+            if endpoint.failures >= self.max_failures:
+                penalty = self.cooldown * 2 ** (endpoint.failures - self.max_failures)
+                endpoint.down_until = self._clock() + penalty
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def record_hedge(self, won: bool = False) -> None:
+        with self._lock:
+            if won:
+                self.hedges_won += 1
+            else:
+                self.hedges_fired += 1
+
+    def add_extra_tokens(self, tokens: int) -> None:
+        with self._lock:
+            self.extra_tokens += tokens
+
+    def report(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedges_fired": self.hedges_fired,
+                "hedges_won": self.hedges_won,
+                "extra_tokens": self.extra_tokens,
+                "endpoints": [
+                    {
+                        "base_url": e.base_url,
+                        "healthy": e.healthy(now),
+                        "failures": e.failures,
+                        "latency": round(e.latency, 3) if e.latency is not None else None,
+                    }
+                    for e in self.endpoints
+                ],
+            }
@@ -0,0 +1,104 @@
+"""Local merge of the parallel sub-reviewers' findings.
+
+Her odaklı reviewer kısa bir madde listesi döndürür. Burada maddeler
+ayrıştırılır, aynı sorunu anlatan bulgular (aynı/komşu satır ve benzer
+metin) birleştirilir ve önem derecesi, kaç reviewer'ın aynı şeyi
+söylediği ve odak önceliğine göre sıralanır. FixerAgent tek, tekrarsız bir
+liste görür.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence, Set
+
+
+SEVERITIES = {"yüksek": 3, "high": 3, "orta": 2, "medium": 2, "düşük": 1, "low": 1}
+SEVERITY_LABELS = {3: "yüksek", 2: "orta", 1: "düşük"}
+
+# ties are broken in this order: a security finding outranks a style nit
+FOCUS_ORDER = ("security", "correctness", "performance", "style")
+
+# keeps the fixer prompt short; the tail is almost always style nits
+MAX_FINDINGS = 12
+
+_ITEM_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.*\S)")
+_SEVERITY_RE = re.compile(r"^\[?\s*(yüksek|orta|düşük|high|medium|low)\s*\]?\s*[:\-–]?\s*", re.IGNORECASE)
+_LINE_RE = re.compile(r"\b(?:[Ll]ines?|[Ss]at[ıi]r(?:lar)?)\s+(\d+)")
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+class Finding:
+    """One issue reported by one or more sub-reviewers."""
+
+    def __init__(self, focus: str, severity: int, text: str, line: Optional[int] = None) -> None:
+        self.foci: List[str] = [focus]
+        self.severity = severity
+        self.text = text
+        self.line = line
+        self.words: Set[str] = set(_WORD_RE.findall(text.lower()))
+
+    def similar(self, other: "Finding") -> bool:
+        if self.line is not None and other.line is not None and abs(self.line - other.line) > 1:
+            return False
+        if not self.words or not other.words:
+            return self.text.lower() == other.text.lower()
+        overlap = len(self.words & other.words) / len(self.words | other.words)
+        # same line needs less textual agreement than an unlocated finding
+        return overlap >= (0.3 if self.line is not None and self.line == other.line else 0.6)
+
+    def absorb(self, other: "Finding") -> None:
+        for focus in other.foci:
+            if focus not in self.foci:
+                self.foci.append(focus)
+        if other.severity > self.severity or (other.severity == self.severity and len(other.text) > len(self.text)):
+            self.severity, self.text = max(self.severity, other.severity), other.text
+        if self.line is None:
+            self.line = other.line
+
+    def rank(self):
+        focus = min((FOCUS_ORDER.index(f) for f in self.foci if f in FOCUS_ORDER), default=len(FOCUS_ORDER))
+        return (-self.severity, -len(self.foci), focus, self.line if self.line is not None else 10 ** 9)
+
+
+def parse_findings(focus: str, text: str) -> List[Finding]:
+    """Turn one sub-reviewer's answer into findings; prose lines are ignored."""
+    findings = []
+    for raw in text.splitlines():
+        match = _ITEM_RE.match(raw)
+        if not match:
+            continue
+        body = match.group(1)
+        severity = 2
+        tag = _SEVERITY_RE.match(body)
+        if tag:
+            severity = SEVERITIES[tag.group(1).lower()]
+            body = body[tag.end():]
+        line = _LINE_RE.search(body)
+        findings.append(Finding(focus, severity, body.strip(), int(line.group(1)) if line else None))
+    return findings
+
+
+def merge_findings(results: Dict[str, str], limit: int = MAX_FINDINGS) -> List[Finding]:
+    """Dedupe and rank the findings of all sub-reviewers (``focus -> answer``)."""
+    merged: List[Finding] = []
+    for focus in sorted(results, key=lambda f: FOCUS_ORDER.index(f) if f in FOCUS_ORDER else len(FOCUS_ORDER)):
+        for finding in parse_findings(focus, results[focus]):
+            for existing in merged:
+                if existing.similar(finding):
+                    existing.absorb(finding)
+                    break
+            else:
+                merged.append(finding)
+    merged.sort(key=Finding.rank)
+    return merged[:limit]
+
+
+def render_findings(findings: Sequence[Finding], foci: Sequence[str]) -> str:
+    """Review notes for FixerAgent in the same register as a single review."""
+    if not findings:
+        return f"İnceleme ({', '.join(foci)}): önemli bir sorun bulunmadı."
+    lines = [f"İnceleme bulguları ({', '.join(foci)}), önem sırasına göre:"]
+    for number, finding in enumerate(findings, 1):
+        lines.append(f"{number}. [{SEVERITY_LABELS[finding.severity]}] ({', '.join(finding.foci)}) {finding.text}")
+    return "\n".join(lines)
@@ -0,0 +1,351 @@
+"""Failure-signature → patch memo for the pytest retry loop.
+
+Aynı test hataları (eksik modül, yanlış fixture adı, ...) çalıştırmadan
+çalıştırmaya tekrar eder. Burada pytest çıktısı imzalara indirgenir:
+
+* aşama (toplama / çalışma), istisna türü,
+* çerçeve şekli (``test>main`` gibi dosya rolleri dizisi),
+* mesaj şablonu (tırnaklı değerler parametre, sayılar ``<n>``).
+
+Bir düzeltme turu bir imzayı ortadan kaldırdığında kodda yapılan küçük
+değişiklik (tırnaklı değerler parametreleştirilmiş satır farkları) o imza
+için kaydedilir. Aynı imza tekrar görülünce yama LLM'e gitmeden yerelde
+uygulanır; işe yaramazsa normal FixerAgent turuna dönülür.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .file_tools import write_text_atomic
+from .stage_stats import DATA_DIR
+
+
+MEMO_FILE = DATA_DIR / "fix_memo.json"
+
+# only small, local edits are worth replaying; a rewrite is not a "fix pattern"
+MAX_HUNKS = 3
+MAX_CHANGED_LINES = 30
+_CONTEXT_LINES = 2
+
+_SECTION_RE = re.compile(r"^_{3,} (.+?) _{3,}$")
+_FRAME_RE = re.compile(r"^(\S+\.py):\d+:(?:\s|$)")
+_ERROR_RE = re.compile(r"^E\s+(.*\S)")
+_EXC_RE = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt|Warning))(?::\s*(.*))?$")
+_QUOTED_RE = re.compile(r"'([^'\n]*)'|\"([^\"\n]*)\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_ADDR_RE = re.compile(r"0x[0-9a-fA-F]+")
+_PATH_RE = re.compile(r"(?:/[\w.\-]+){2,}")
+
+
+class Failure:
+    """One normalized pytest failure."""
+
+    def __init__(self, phase: str, exc_type: str, shape: str, template: str, params: Sequence[str]) -> None:
+        self.phase = phase
+        self.exc_type = exc_type
+        self.shape = shape
+        self.template = template
+        self.params = list(params)
+        raw = f"{phase}|{exc_type}|{shape}|{template}"
+        self.signature = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def describe(self) -> str:
+        return f"{self.exc_type}: {self.template}" if self.template else self.exc_type
+
+
+def _template(message: str) -> Tuple[str, List[str]]:
+    params: List[str] = []
+
+    def quoted(match: re.Match) -> str:
+        params.append(match.group(1) if match.group(1) is not None else match.group(2))
+        return f"'<p{len(params) - 1}>'"
+
+    message = _PATH_RE.sub("<path>", _ADDR_RE.sub("<addr>", message))
+    message = _QUOTED_RE.sub(quoted, message)
+    return _NUMBER_RE.sub("<n>", message), params
+
+
+def _role(filename: str) -> str:
+    name = Path(filename).name
+    if name.startswith("test_") or name == "conftest.py":
+        return "test"
+    return "main" if name == "main.py" else "lib"
+
+
+def _failure(phase: str, frames: List[str], errors: List[str]) -> Optional[Failure]:
+    if not errors:
+        return None
+    exc_type, message = "Error", errors[0]
+    for line in errors:
+        match = _EXC_RE.match(line)
+        if match:
+            exc_type, message = match.group(1).rsplit(".", 1)[-1], match.group(2) or ""
+            break
+    else:
+        if errors[0].startswith("assert "):
+            exc_type = "AssertionError"
+    shape: List[str] = []
+    for frame in frames:
+        role = _role(frame)
+        if not shape or shape[-1] != role:
+            shape.append(role)
+    template, params = _template(message)
+    return Failure(phase, exc_type, ">".join(shape), template, params)
+
+
+def parse_failures(output: str) -> List[Failure]:
+    """Split pytest output into failures, one per distinct signature."""
+    sections: List[Tuple[str, List[str], List[str]]] = []
+    phase = "call"
+    frames: List[str] = []
+    errors: List[str] = []
+    for line in output.splitlines():
+        header = _SECTION_RE.match(line)
+        if header:
+            if errors:
+                sections.append((phase, frames, errors))
+            phase = "collect" if header.group(1).startswith("ERROR collecting") else "call"
+            frames, errors = [], []
+            continue
+        frame = _FRAME_RE.match(line)
+        if frame:
+            frames.append(frame.group(1))
+            continue
+        error = _ERROR_RE.match(line)
+        if error:
+            errors.append(error.group(1))
+    if errors:
+        sections.append((phase, frames, errors))
+
+    failures: List[Failure] = []
+    seen = set()
+    for phase, frames, errors in sections:
+        failure = _failure(phase, frames, errors)
+        if failure is not None and failure.signature not in seen:
+            seen.add(failure.signature)
+            failures.append(failure)
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# patches
+# ---------------------------------------------------------------------------
+def _placeholder(index: int) -> str:
+    return f"\x00{index}\x00"
+
+
+def _abstract(lines: Sequence[str], params: Sequence[str]) -> List[str]:
+    # whole tokens only ('id' must not turn 'valid' into a placeholder);
+    # longest first so 'requests.adapters' is not split by 'requests'
+    ordered = sorted(((p, i) for i, p in enumerate(params) if len(p) >= 2), key=lambda x: -len(x[0]))
+    if not ordered:
+        return list(lines)
+    index_of: Dict[str, int] = {}
+    for value, index in ordered:
+        index_of.setdefault(value, index)
+    pattern = re.compile("|".join(rf"(?<!\w){re.escape(value)}(?!\w)" for value, _ in ordered))
+    return [pattern.sub(lambda m: _placeholder(index_of[m.group(0)]), line) for line in lines]
+
+
+def _instantiate(lines: Sequence[str], params: Sequence[str]) -> Optional[List[str]]:
+    result = []
+    for line in lines:
+        for index in map(int, re.findall(r"\x00(\d+)\x00", line)):
+            if index >= len(params):
+                return None
+            line = line.replace(_placeholder(index), params[index])
+        result.append(line)
+    return result
+
+
+def make_patch(before: str, after: str, params: Sequence[str] = ()) -> Optional[List[Dict[str, Any]]]:
+    """Line hunks turning ``before`` into ``after``; None if the change is too large."""
+    old, new = before.splitlines(), after.splitlines()
+    hunks = []
+    changed = 0
+    previous_end = 0
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        changed += (i2 - i1) + (j2 - j1)
+        # context never reaches into the previous hunk, which is already rewritten
+        start = max(previous_end, i1 - _CONTEXT_LINES)
+        previous_end = i2
+        hunks.append(
+            {
+                "context": _abstract(old[start:i1], params),
+                "at_start": i1 == 0,
+                "removed": _abstract(old[i1:i2], params),
+                "added": _abstract(new[j1:j2], params),
+            }
+        )
+    if not hunks or len(hunks) > MAX_HUNKS or changed > MAX_CHANGED_LINES:
+        return None
+    return hunks
+
+
+def apply_patch(code: str, hunks: Sequence[Dict[str, Any]], params: Sequence[str] = ()) -> Optional[str]:
+    """Apply recorded hunks by matching their context; None if they do not fit."""
+    lines = code.splitlines()
+    for hunk in hunks:
+        context = _instantiate(hunk["context"], params)
+        removed = _instantiate(hunk["removed"], params)
+        added = _instantiate(hunk["added"], params)
+        if context is None or removed is None or added is None:
+            return None
+        strip = [line.rstrip() for line in lines]
+        want_ctx = [line.rstrip() for line in context]
+        want_rm = [line.rstrip() for line in removed]
+        candidates = [0] if hunk["at_start"] else range(len(want_ctx), len(lines) + 1)
+        for index in candidates:
+            if strip[index - len(want_ctx):index] == want_ctx and strip[index:index + len(want_rm)] == want_rm:
+                lines[index:index + len(removed)] = added
+                break
+        else:
+            return None
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# store
+# ---------------------------------------------------------------------------
+class FixMemo:
+    """Size-bounded signature → patch store with hit-rate counters.
+
+    En fazla ``max_entries`` imza tutulur (en uzun süredir kullanılmayan
+    atılır); her imza için en fazla ``max_patches`` yama saklanır ve
+    başarısız olmaya devam eden yamalar silinir.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = MEMO_FILE, max_entries: int = 200, max_patches: int = 3) -> None:
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self.max_patches = max_patches
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.counters = {"lookups": 0, "hits": 0, "fixed": 0, "recorded": 0}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return
+        if isinstance(data, dict):
+            self._entries = data.get("entries", {})
+            self.counters.update(data.get("counters", {}))
+
+    def save(self) -> None:
+        """Write the store if anything changed since the last save."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"counters": self.counters, "entries": self._entries}, ensure_ascii=False)
+            self._dirty = False
+        write_text_atomic(self.path, payload)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, failures: Sequence[Failure], code: str, skip: Sequence[str] = ()) -> Tuple[Optional[str], List[Tuple[str, int]]]:
+        """Apply every known patch that fits ``code``.
+
+        Returns the patched code (None if nothing applied) and the
+        ``(signature, patch index)`` pairs used, for `outcome`.
+        """
+        applied: List[Tuple[str, int]] = []
+        with self._lock:
+            for failure in failures:
+                if failure.signature in skip:
+                    continue
+                self.counters["lookups"] += 1
+                self._dirty = True
+                entry = self._entries.get(failure.signature)
+                if entry is None:
+                    continue
+                for index, patch in enumerate(entry["patches"]):
+                    patched = apply_patch(code, patch["hunks"], failure.params)
+                    if patched is not None and patched != code:
+                        code = patched
+                        applied.append((failure.signature, index))
+                        entry["used"] = time.time()
+                        self.counters["hits"] += 1
+                        break
+        # a miss only moves the counters; those are flushed once per run
+        if applied:
+            self.save()
+        return (code if applied else None), applied
+
+    def outcome(self, applied: Sequence[Tuple[str, int]], remaining: Sequence[Failure]) -> None:
+        """Score locally applied patches by whether their signature went away."""
+        still = {f.signature for f in remaining}
+        with self._lock:
+            self._dirty = True
+            for signature, index in applied:
+                entry = self._entries.get(signature)
+                if entry is None or index >= len(entry["patches"]):
+                    continue
+                patch = entry["patches"][index]
+                if signature in still:
+                    patch["failures"] += 1
+                    if patch["failures"] > patch["successes"]:
+                        del entry["patches"][index]
+                        if not entry["patches"]:
+                            del self._entries[signature]
+                else:
+                    patch["successes"] += 1
+                    self.counters["fixed"] += 1
+        self.save()
+
+    def record(self, fixed: Sequence[Failure], before: str, after: str) -> int:
+        """Remember the ``before`` → ``after`` edit for failures it made disappear."""
+        count = 0
+        with self._lock:
+            for failure in fixed:
+                hunks = make_patch(before, after, failure.params)
+                if hunks is None:
+                    continue
+                entry = self._entries.setdefault(
+                    failure.signature, {"describe": failure.describe(), "patches": [], "used": time.time()}
+                )
+                if any(p["hunks"] == hunks for p in entry["patches"]):
+                    continue
+                entry["patches"].insert(0, {"hunks": hunks, "successes": 0, "failures": 0})
+                del entry["patches"][self.max_patches:]
+                entry["used"] = time.time()
+                count += 1
+            self.counters["recorded"] += count
+            self._dirty = self._dirty or bool(count)
+            # least recently used signatures go first
+            while len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda s: self._entries[s]["used"])
+                del self._entries[oldest]
+        if count:
+            self.save()
+        return count
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._entries)
+        lookups, hits = counters["lookups"], counters["hits"]
+        return {
+            **counters,
+            "entries": entries,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "fix_rate": round(counters["fixed"] / hits, 3) if hits else 0.0,
+        }
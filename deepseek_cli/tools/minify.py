@@ -0,0 +1,170 @@
+"""AST/tokenize based compaction of generated code before it goes into prompts.
+
+CoderAgent yorum ve docstring eklemeye yönlendirildiği için review, test ve
+fix prompt'larında kodun önemli bir kısmı modele bir şey katmayan metindir.
+`minify` yorumları, docstring'leri ve boş satırları çıkarır; `LineMap`
+sıkıştırılmış koddaki satır numaralarını orijinale (ve tersine) çevirir,
+böylece reviewer notları ve pytest çıktısı kaydedilen dosyayla uyuşur.
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+import re
+import tokenize
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# what each stage can do without; tests keep docstrings because they state
+# the intended behaviour. The fixer is never compacted: its answer replaces
+# the saved code, which would lose every comment and docstring
+STAGE_POLICIES: Dict[str, Dict[str, bool]] = {
+    "review": {"comments": True, "docstrings": True, "blank_lines": True},
+    "tests": {"comments": True, "docstrings": False, "blank_lines": True},
+    # parallel sub-reviewers; the style reviewer judges comments and layout itself
+    "review_security": {"comments": True, "docstrings": True, "blank_lines": True},
+    "review_correctness": {"comments": True, "docstrings": True, "blank_lines": True},
+    "review_performance": {"comments": True, "docstrings": True, "blank_lines": True},
+}
+
+# "line 12", "satır 12", "lines 3-5"; the lookbehind skips traceback lines
+# (File "x.py", line 12) which are handled per file name
+_GENERIC_REF_RE = re.compile(r'(?<!", )\b((?:[Ll]ines?|[Ss]at[ıi]r(?:lar)?)\s+)(\d+)(?:(\s*[-–]\s*)(\d+))?')
+
+
+class LineMap:
+    """Maps line numbers of the compacted code (1-based) to the original."""
+
+    def __init__(self, original_lines: List[int], original_count: Optional[int] = None) -> None:
+        # original_lines[i] is the original number of compact line i + 1
+        self.original_lines = original_lines
+        if original_count is None:
+            original_count = original_lines[-1] if original_lines else 0
+        self.original_count = original_count
+
+    def to_original(self, line: int) -> int:
+        if 1 <= line <= len(self.original_lines):
+            return self.original_lines[line - 1]
+        return line
+
+    def to_compact(self, line: int) -> int:
+        """Compact line of ``line``; removed lines map to the next kept one."""
+        index = bisect_left(self.original_lines, line)
+        return min(index, len(self.original_lines) - 1) + 1 if self.original_lines else line
+
+    def _rewrite(self, text: str, convert, limit: int, filename: Optional[str]) -> str:
+        # numbers outside the mapped code (1..limit) refer to something else
+        def generic(match: re.Match) -> str:
+            numbers = [int(n) for n in (match.group(2), match.group(4)) if n]
+            if not all(1 <= n <= limit for n in numbers):
+                return match.group(0)
+            out = match.group(1) + str(convert(numbers[0]))
+            if match.group(4):
+                out += match.group(3) + str(convert(numbers[1]))
+            return out
+
+        def qualified(match: re.Match) -> str:
+            number = int(match.group(2) or match.group(4))
+            prefix = match.group(1) or match.group(3)
+            return prefix + str(convert(number) if 1 <= number <= limit else number)
+
+        text = _GENERIC_REF_RE.sub(generic, text)
+        if filename:
+            name = re.escape(filename)
+            # pytest "main.py:12: in f" and traceback 'File ".../main.py", line 12'
+            pattern = re.compile(rf'(\b{name}:)(\d+)|(\b{name}", line )(\d+)')
+            text = pattern.sub(qualified, text)
+        return text
+
+    def refs_to_original(self, text: str, filename: Optional[str] = None) -> str:
+        """Rewrite line references in model output to original line numbers."""
+        return self._rewrite(text, self.to_original, len(self.original_lines), filename)
+
+    def refs_to_compact(self, text: str, filename: Optional[str] = None) -> str:
+        """Rewrite references to the original file (e.g. pytest output) for the compact code."""
+        return self._rewrite(text, self.to_compact, self.original_count, filename)
+
+
+def _docstring_lines(tree: ast.AST, lines: List[str]) -> Tuple[Set[int], Dict[int, str]]:
+    """Lines taken up by docstrings, plus ``...`` stubs for bodies that would become empty."""
+    removed: Set[int] = set()
+    stubs: Dict[int, str] = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        body = node.body
+        if not body or not isinstance(body[0], ast.Expr):
+            continue
+        value = body[0].value
+        if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+            continue
+        doc = body[0]
+        first, last = doc.lineno, doc.end_lineno or doc.lineno
+        # only docstrings standing on their own lines
+        if lines[first - 1][: doc.col_offset].strip() or lines[last - 1][doc.end_col_offset:].strip():
+            continue
+        removed.update(range(first, last + 1))
+        if len(body) == 1:
+            stubs[first] = lines[first - 1][: doc.col_offset] + "..."
+    return removed, stubs
+
+
+def minify(
+    code: str,
+    comments: bool = True,
+    docstrings: bool = True,
+    blank_lines: bool = True,
+) -> Tuple[str, LineMap]:
+    """Return ``code`` without comments/docstrings/blank lines and its line map.
+
+    Kod derlenemiyorsa (ör. model yarım bir blok döndürdüyse) olduğu gibi
+    döndürülür.
+    """
+    lines = code.splitlines()
+    identity = LineMap(list(range(1, len(lines) + 1)), len(lines))
+    try:
+        tree = ast.parse(code)
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+    except (SyntaxError, tokenize.TokenError, IndentationError):
+        return code, identity
+
+    # lines inside multi-line strings are content, never touched
+    protected: Set[int] = set()
+    cut_at: Dict[int, int] = {}
+    for tok in tokens:
+        if tok.type == tokenize.STRING and tok.end[0] > tok.start[0]:
+            protected.update(range(tok.start[0] + 1, tok.end[0] + 1))
+        elif tok.type == tokenize.COMMENT and comments:
+            cut_at[tok.start[0]] = tok.start[1]
+
+    removed: Set[int] = set()
+    stubs: Dict[int, str] = {}
+    if docstrings:
+        removed, stubs = _docstring_lines(tree, lines)
+
+    out: List[str] = []
+    original: List[int] = []
+    for number, line in enumerate(lines, 1):
+        if number in stubs:
+            out.append(stubs[number])
+            original.append(number)
+            continue
+        if number in removed:
+            continue
+        if number in cut_at:
+            line = line[: cut_at[number]].rstrip()
+            if not line.strip():
+                continue
+        if blank_lines and not line.strip() and number not in protected:
+            continue
+        out.append(line)
+        original.append(number)
+
+    compact = "\n".join(out)
+    try:
+        ast.parse(compact)
+    except SyntaxError:
+        return code, identity
+    return compact, LineMap(original, len(lines))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import ast
+import re
+from typing import List, Optional
+
+from .token_budget import estimate_tokens, shrink_text
+
+
+_DEF_RE = re.compile(r"^(?:async\s+)?(?:def|class)\s+(\w+)", re.MULTILINE)
+
+# "### Tur N isteği" heading and the code fence around a verbatim turn
+_TURN_OVERHEAD = 16
+
+
+def _outline(code: str, limit: int = 8) -> str:
+    """Top-level class/function names of ``code`` (regex fallback for broken code)."""
+    try:
+        tree = ast.parse(code)
+        names = [
+            node.name
+            for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        ]
+    except SyntaxError:
+        names = _DEF_RE.findall(code)
+    if len(names) > limit:
+        names = names[:limit] + [f"+{len(names) - limit}"]
+    return ", ".join(names)
+
+
+def _first_line(text: str, width: int = 120) -> str:
+    line = text.strip().splitlines()[0] if text.strip() else ""
+    return line if len(line) <= width else line[: width - 1] + "…"
+
+
+class Turn:
+    """One REPL exchange: the request and the code it produced."""
+
+    def __init__(self, index: int, prompt: str, code: str) -> None:
+        self.index = index
+        self.prompt = prompt
+        self.code = code
+
+    def summary(self) -> str:
+        outline = _outline(self.code)
+        line = f"- Tur {self.index}: {_first_line(self.prompt)}"
+        return line + (f" → {outline}" if outline else "")
+
+
+class SessionMemory:
+    """Bounded context carried across REPL turns.
+
+    Son ``recent_turns`` tur (istek + kod) aynen saklanır; payına sığmayan
+    istek de kod gibi kısaltılır. Daha eski turlar tek satırlık özetlere
+    indirgenir. Özetler yalnızca sona eklenir ve
+    bağlamın başında durur, böylece art arda gelen turlarda prompt'un başı
+    değişmez ve sağlayıcının prompt önbelleği isabet eder. Özet bölümü
+    ``budget``'ın dörtte birini aşınca tüm özetler tek bir kayan satırda
+    birleştirilir; bellek ve turn başına token kullanımı oturum uzunluğundan
+    bağımsız kalır.
+    """
+
+    HEADER = "## Oturum bağlamı (önceki istekler)"
+
+    def __init__(self, budget: int = 6000, recent_turns: int = 2) -> None:
+        self.budget = budget
+        self.recent_turns = max(1, recent_turns)
+        self.summary_budget = budget // 4
+        self.turns = 0
+        self._summaries: List[str] = []
+        self._recent: List[Turn] = []
+
+    def __len__(self) -> int:
+        return self.turns
+
+    def clear(self) -> None:
+        self.turns = 0
+        self._summaries = []
+        self._recent = []
+
+    def add(self, prompt: str, code: str) -> None:
+        self.turns += 1
+        self._recent.append(Turn(self.turns, prompt, code))
+        while len(self._recent) > self.recent_turns:
+            self._summaries.append(self._recent.pop(0).summary())
+        if estimate_tokens("\n".join(self._summaries)) > self.summary_budget:
+            self._fold()
+
+    def _fold(self) -> None:
+        """Merge all summaries into one rolling line.
+
+        Birleşik satırda yalnızca istekler kalır (kod özetleri düşer); satır
+        yine de uzunsa en yeni kısmı korunur.
+        """
+        # folding everything at once keeps folds (prefix changes) rare
+        merged = self._summaries
+        first = re.match(r"^- Tur (\d+)", merged[0])
+        last = re.match(r"^- Tur (?:\d+–)?(\d+)", merged[-1])
+        start = first.group(1) if first else "1"
+        end = last.group(1) if last else start
+        requests = [re.sub(r"^- Tur [\d–]+: ", "", line).split(" → ")[0] for line in merged]
+        body = "; ".join(requests)
+        limit = self.summary_budget // 3
+        tokens = estimate_tokens(body)
+        if tokens > limit:
+            body = "…" + body[-int(len(body) * limit / tokens):]
+        self._summaries = [f"- Tur {start}–{end}: {body}"]
+
+    def context(self) -> Optional[str]:
+        """Render the memory as a prompt prefix, or None for a fresh session."""
+        if not self.turns:
+            return None
+        head = "\n".join([self.HEADER] + self._summaries)
+        recent_budget = max(self.budget - estimate_tokens(head), 0)
+        # estimates of the parts do not add up exactly (headers, sampling of
+        # long text), so the whole is measured and the turns cut again if needed
+        for _ in range(4):
+            context = head + self._render_recent(recent_budget)
+            overflow = estimate_tokens(context) - self.budget
+            if overflow <= 0 or recent_budget == 0:
+                break
+            recent_budget = max(recent_budget - overflow - _TURN_OVERHEAD, 0)
+        return context
+
+    def _render_recent(self, budget: int) -> str:
+        # newest turn gets the larger share; older verbatim turns are cut first
+        shares = [budget // (2 ** (len(self._recent) - i)) for i in range(len(self._recent))]
+        shares[-1] += budget - sum(shares)
+        rendered = ""
+        for turn, share in zip(self._recent, shares):
+            body = max(share - _TURN_OVERHEAD, 0)
+            # a request with pasted code is cut like the code, or one turn
+            # could carry a whole file past the budget
+            prompt_budget = max(body - estimate_tokens(turn.code), body // 2)
+            prompt = shrink_text(turn.prompt.strip(), prompt_budget)
+            code = shrink_text(turn.code, max(body - estimate_tokens(prompt), 0), keep="head")
+            rendered += f"\n\n### Tur {turn.index} isteği\n{prompt}\n```python\n{code}\n```"
+        return rendered
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .file_tools import write_text_atomic
+
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR.mkdir(exist_ok=True)
+STATS_FILE = DATA_DIR / "stage_stats.json"
+
+
+class StageStats:
+    """Rolling per-stage measurements (latency etc.) persisted between runs.
+
+    Her aşama ve metrik için son ``window`` ölçüm saklanır; tahminler bu
+    örneklerin yüzdeliklerinden üretilir. `record` yalnızca belleği günceller;
+    dosya çalıştırma sonunda tek bir `save` ile yazılır.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = STATS_FILE, window: int = 50) -> None:
+        self.path = Path(path) if path is not None else None
+        self.window = window
+        self._samples: Dict[str, Dict[str, List[float]]] = {}
+        # parallel component calls record from several threads
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return
+        if isinstance(data, dict):
+            self._samples = data
+
+    def save(self) -> None:
+        """Persist the samples if anything was recorded since the last save."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._samples)
+            write_text_atomic(self.path, payload)
+            self._dirty = False
+
+    def record(self, stage: str, metric: str, value: float) -> None:
+        """Append a measurement (in memory; see `save`)."""
+        with self._lock:
+            samples = self._samples.setdefault(stage, {}).setdefault(metric, [])
+            samples.append(round(float(value), 3))
+            del samples[:-self.window]
+            self._dirty = True
+
+    def samples(self, stage: str, metric: str) -> List[float]:
+        with self._lock:
+            return list(self._samples.get(stage, {}).get(metric, []))
+
+    def percentile(self, stage: str, metric: str, q: float, default: Optional[float] = None) -> Optional[float]:
+        """Return the ``q`` (0..1) percentile of the stored samples or ``default``."""
+        values = sorted(self.samples(stage, metric))
+        if not values:
+            return default
+        index = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+        return values[index]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Sequence
+
+from .stage_stats import StageStats
+
+
+# GPT/DeepSeek BPE ön-tokenizasyonuna benzeyen kaba bir bölücü: kelimeler,
+# en fazla 3 haneli sayı grupları, noktalama dizileri ve boşluklar.
+_PIECE_RE = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+")
+
+# beyond this size only a few windows are tokenized and the result is scaled,
+# which keeps a single estimate well under a millisecond
+_EXACT_LIMIT = 4096
+_SAMPLE_WINDOWS = 4
+_WINDOW_SIZE = 1024
+
+# "... [N satır kısaltıldı] ..." plus the surrounding newlines
+_MARKER_TOKENS = 12
+
+# per-message overhead of the chat format (role markers etc.)
+_MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Return an approximate token count for ``text`` without any network call."""
+    if not text:
+        return 0
+    if len(text) <= _EXACT_LIMIT:
+        return len(_PIECE_RE.findall(text))
+    step = (len(text) - _WINDOW_SIZE) // (_SAMPLE_WINDOWS - 1)
+    sampled = 0
+    for i in range(_SAMPLE_WINDOWS):
+        start = i * step
+        sampled += len(_PIECE_RE.findall(text, start, start + _WINDOW_SIZE))
+    return int(sampled * len(text) / (_SAMPLE_WINDOWS * _WINDOW_SIZE)) + 1
+
+
+def estimate_messages(messages: Sequence[dict]) -> int:
+    return sum(estimate_tokens(m.get("content") or "") + _MESSAGE_OVERHEAD for m in messages)
+
+
+def shrink_text(text: str, max_tokens: int, keep: str = "both") -> str:
+    """Cut ``text`` down to roughly ``max_tokens`` keeping whole lines.
+
+    ``keep`` selects which part survives: ``"head"``, ``"tail"`` (useful for
+    pytest output where the summary is at the end) or ``"both"``.
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    lines = text.splitlines()
+    chars_per_token = len(text) / max(tokens, 1)
+    # leave room for the marker line that replaces the removed part
+    char_budget = int(max(max_tokens - _MARKER_TOKENS, 0) * chars_per_token)
+
+    head: List[str] = []
+    tail: List[str] = []
+    head_budget = char_budget if keep == "head" else (0 if keep == "tail" else char_budget // 2)
+    tail_budget = char_budget - head_budget
+    used = 0
+    for line in lines:
+        if used + len(line) + 1 > head_budget:
+            break
+        head.append(line)
+        used += len(line) + 1
+    used = 0
+    for line in reversed(lines[len(head):]):
+        if used + len(line) + 1 > tail_budget:
+            break
+        tail.append(line)
+        used += len(line) + 1
+    tail.reverse()
+
+    skipped = len(lines) - len(head) - len(tail)
+    marker = f"... [{skipped} satır kısaltıldı] ..."
+    return "\n".join(head + [marker] + tail)
+
+
+class PromptTooLarge(RuntimeError):
+    """Raised when the sections that must stay whole do not fit the input budget."""
+
+
+class Section:
+    """A named part of a prompt with a trimming priority.
+
+    Lower ``priority`` sections are trimmed first; ``required`` sections are
+    never trimmed.
+    """
+
+    def __init__(self, name: str, text: str, priority: int = 1, keep: str = "both", required: bool = False) -> None:
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.keep = keep
+        self.required = required
+
+
+class TokenBudget:
+    """Input/output token limits of one agent."""
+
+    def __init__(self, input_limit: int, output_limit: int, min_output: int = 256) -> None:
+        self.input_limit = input_limit
+        self.output_limit = output_limit
+        self.min_output = min(min_output, output_limit)
+
+    def fit(self, system_msg: str, sections: Sequence[Section]) -> List[str]:
+        """Return section texts trimmed so the whole prompt fits ``input_limit``.
+
+        Raises `PromptTooLarge` if it still does not fit once every
+        non-required section is cut down to its stub.
+        """
+        texts = [s.text for s in sections]
+        sizes = [estimate_tokens(t) for t in texts]
+        fixed = estimate_tokens(system_msg) + 2 * _MESSAGE_OVERHEAD
+        overflow = fixed + sum(sizes) - self.input_limit
+        if overflow <= 0:
+            return texts
+
+        for index in sorted(range(len(sections)), key=lambda i: sections[i].priority):
+            if overflow <= 0:
+                break
+            if sections[index].required:
+                continue
+            # leave at least a small stub of every section so the model knows it existed
+            target = max(sizes[index] - overflow, min(sizes[index], 64))
+            if target >= sizes[index]:
+                continue
+            texts[index] = shrink_text(texts[index], target, sections[index].keep)
+            new_size = estimate_tokens(texts[index])
+            overflow -= sizes[index] - new_size
+            sizes[index] = new_size
+        if overflow > 0 and any(s.required for s in sections):
+            names = ", ".join(s.name for s in sections if s.required)
+            raise PromptTooLarge(f"'{names}' girdi bütçesine sığmıyor (~{overflow} token fazla)")
+        return texts
+
+    def max_tokens(self, stage: str, stats: Optional[StageStats] = None) -> int:
+        """Output limit for ``stage`` based on how long its past outputs were."""
+        if stats is None:
+            return self.output_limit
+        p95 = stats.percentile(stage, "output_tokens", 0.95)
+        if p95 is None:
+            return self.output_limit
+        # headroom over the historical p95 so typical answers are never cut
+        return int(min(self.output_limit, max(self.min_output, p95 * 1.5)))
@@ -0,0 +1,145 @@
+"""Watch mode: re-run the pipeline when the prompt file or the saved code changes.
+
+Aşamalar girdi hash'lerine göre `RunStore` içinde memoize edildiği için bir
+değişiklik yalnızca ondan etkilenen aşamaları yeniden çalıştırır:
+
+* prompt dosyası değişirse plan/todo/code ve sonrası,
+* kaydedilen kod elle düzenlenirse yalnızca review, fix ve testler.
+
+Dosya olayları `debounce` süresi boyunca sakinleşene kadar beklenir; yeni bir
+değişiklik geldiğinde çalışan (artık eskimiş) pipeline iptal edilir.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from deepseek_cli.crew_runner import CrewRunner, StageCancelled
+from deepseek_cli.tools.file_tools import write_text_to_file
+
+
+RunnerFactory = Callable[[str, Optional[str], threading.Event], CrewRunner]
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8")
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+class Watcher:
+    """Polls two files and drives one background pipeline run at a time."""
+
+    def __init__(
+        self,
+        prompt_file: Union[str, Path],
+        save_path: Union[str, Path],
+        make_runner: RunnerFactory,
+        debounce: float = 0.5,
+        poll_interval: float = 0.2,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> None:
+        self.prompt_file = Path(prompt_file)
+        self.save_path = Path(save_path)
+        self.make_runner = make_runner
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.on_error = on_error
+        self.runs = 0
+        self._prompt: Optional[str] = None
+        self._seen_output: Optional[str] = None
+        self._code_override: Optional[str] = None
+        # content we wrote ourselves; must not count as a user edit
+        self._written: Optional[str] = None
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._cancel: Optional[threading.Event] = None
+
+    # ------------------------------------------------------------------
+    def prime(self) -> bool:
+        """Take the current files as the baseline; True if there is a prompt to run."""
+        self._prompt = _read(self.prompt_file)
+        # code saved by an earlier session is the previous result, not a hand edit
+        self._seen_output = self._written = _read(self.save_path)
+        return self._prompt is not None
+
+    def poll(self) -> bool:
+        """Read both files; return True if something relevant changed."""
+        changed = False
+        prompt = _read(self.prompt_file)
+        if prompt is not None and prompt != self._prompt:
+            self._prompt = prompt
+            # a new request invalidates any hand edits to the old code
+            self._code_override = None
+            changed = True
+        output = _read(self.save_path)
+        if output is not None and output != self._seen_output:
+            self._seen_output = output
+            with self._lock:
+                own = self._written is not None and output.strip() == self._written.strip()
+            if not own:
+                self._code_override = output
+                changed = True
+        return changed
+
+    def _run_once(self, prompt: str, code: Optional[str], cancel: threading.Event) -> None:
+        try:
+            fixed_code, _ = self.make_runner(prompt, code, cancel).run()
+        except StageCancelled:
+            return
+        except Exception as exc:  # noqa: BLE001 - keep watching after a failed run
+            if self.on_error is not None:
+                self.on_error(exc)
+            return
+        if cancel.is_set():
+            return
+        content = CrewRunner._strip(fixed_code)
+        with self._lock:
+            self._written = content
+        write_text_to_file(self.save_path, content)
+
+    def start_run(self) -> None:
+        """Cancel a stale in-flight run and start a new one with the current inputs."""
+        self.stop_run()
+        if self._prompt is None:
+            return
+        self._cancel = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run_once,
+            args=(self._prompt, self._code_override, self._cancel),
+            daemon=True,
+        )
+        self.runs += 1
+        self._worker.start()
+
+    def stop_run(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            assert self._cancel is not None
+            self._cancel.set()
+            self._worker.join()
+        self._worker = None
+
+    def wait_idle(self, timeout: Optional[float] = None) -> None:
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def loop(self, stop: Optional[threading.Event] = None) -> None:
+        """Watch until ``stop`` is set (or KeyboardInterrupt)."""
+        stop = stop or threading.Event()
+        pending = self.prime()
+        last_change = time.monotonic()
+        try:
+            while not stop.is_set():
+                if self.poll():
+                    pending = True
+                    last_change = time.monotonic()
+                if pending and time.monotonic() - last_change >= self.debounce:
+                    pending = False
+                    self.start_run()
+                stop.wait(self.poll_interval)
+        finally:
+            self.stop_run()
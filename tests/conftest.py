@@ -1,4 +1,39 @@
 import sys
 import os
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent)) 
\ No newline at end of file
+sys.path.insert(0, str(Path(__file__).parent.parent)) 
+import pytest
+
+from deepseek_cli.agents.base_agent import BaseAgent
+
+
+class EchoAgent(BaseAgent):
+    """Minimal agent whose prompt is the given text as a single user message."""
+
+    name = "code"
+
+    def __init__(self):
+        super().__init__("role", "goal", "backstory")
+
+    def build_prompt(self, text):
+        return [{"role": "user", "content": text}]
+
+
+@pytest.fixture
+def echo_agent():
+    return EchoAgent()
+
+
+def _stub_agents(runner):
+    runner._planner.run = lambda prompt: ""
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._coder.run = lambda prompt: "```python\nprint('hello')\n```"
+    runner._reviewer.run = lambda code: ""
+    runner._fixer.run = lambda code, notes: code
+    runner._tester.run = lambda code: "```python\ndef test_dummy():\n    assert True\n```"
+
+
+@pytest.fixture
+def stub_agents():
+    """Replace a CrewRunner's agents with instant, always-passing stubs."""
+    return _stub_agents
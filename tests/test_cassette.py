@@ -0,0 +1,68 @@
+import pytest
+
+from deepseek_cli import config
+from deepseek_cli.agents.base_agent import BaseAgent
+from deepseek_cli.tools.cassette import Cassette, CassetteMiss, request_key
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+def test_record_then_replay_roundtrip(tmp_path, monkeypatch, echo_agent):
+    path = tmp_path / "run.jsonl.gz"
+    agent = echo_agent
+    monkeypatch.setattr(agent, "_request", lambda messages, max_tokens: ("yanıt: " + messages[0]["content"], 7, None))
+    monkeypatch.setattr(BaseAgent, "cassette", Cassette(path, mode="record"))
+    assert agent.run("merhaba") == "yanıt: merhaba"
+
+    slept = []
+    monkeypatch.setattr(BaseAgent, "cassette", Cassette(path, mode="replay", speed=0.5, sleep=slept.append))
+    # network path must not be used while replaying
+    monkeypatch.setattr(agent, "_request", None)
+    assert agent.run("merhaba") == "yanıt: merhaba"
+    assert len(slept) == 1 and slept[0] >= 0
+
+
+def test_replay_scales_chunk_timings(tmp_path):
+    path = tmp_path / "run.jsonl"
+    recorder = Cassette(path, mode="record")
+    key = request_key("m", [{"role": "user", "content": "x"}])
+    recorder.record("code", key, [], "abc", latency=2.0, chunks=[0.5, 1.0, 1.5])
+
+    slept = []
+    player = Cassette(path, mode="replay", speed=0.1, sleep=slept.append)
+    assert player.replay("code", key)["r"] == "abc"
+    assert sum(slept) == pytest.approx(0.2)
+
+
+def test_replay_without_exact_match_fails_loudly(tmp_path):
+    path = tmp_path / "run.jsonl"
+    recorder = Cassette(path, mode="record")
+    recorder.record("review", "k1", [], "first", latency=0.0)
+
+    player = Cassette(path, mode="replay", speed=0)
+    assert player.replay("review", "k1")["r"] == "first"
+    # same stage, different request: no silent positional match
+    with pytest.raises(CassetteMiss):
+        player.replay("review", "other-key")
+
+
+def test_record_mode_keeps_old_cassette_until_first_write(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text('{"k":"old","s":"code","q":[],"r":"x","t":0}\n', encoding="utf-8")
+    recorder = Cassette(path, mode="record")
+    assert "old" in path.read_text(encoding="utf-8")
+    recorder.record("code", "new", [], "y", latency=0.0)
+    assert [line for line in path.read_text(encoding="utf-8").splitlines()] == [
+        '{"k":"new","s":"code","q":[],"r":"y","t":0.0}'
+    ]
+
+
+def test_replay_leaves_stats_untouched(tmp_path, monkeypatch, echo_agent):
+    path = tmp_path / "run.jsonl"
+    key = request_key(config.DEEPSEEK_MODEL, [{"role": "user", "content": "x"}])
+    Cassette(path, mode="record").record("code", key, [], "y", latency=3.0, output_tokens=5)
+    monkeypatch.setattr(BaseAgent, "cassette", Cassette(path, mode="replay", speed=0))
+    echo_agent.stats = StageStats(path=None)
+    # a different output history must not change the request key
+    echo_agent.stats.record("code", "output_tokens", 100)
+    assert echo_agent.run("x") == "y"
+    assert echo_agent.stats.samples("code", "output_tokens") == [100]
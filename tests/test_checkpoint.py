@@ -0,0 +1,87 @@
+import io
+
+import pytest
+from click.testing import CliRunner
+
+from deepseek_cli import cli, config
+from deepseek_cli.crew_runner import CHECKPOINT_ORDER, CrewRunner
+from deepseek_cli.output import JsonOutput
+from deepseek_cli.tools.checkpoint import RunStore
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+def test_run_store_roundtrip_and_discard(tmp_path):
+    store = RunStore.create("[api] prompt", meta={"plan": True}, root=tmp_path)
+    store.save("code", "print(1)")
+    store.save("review", "notes")
+
+    reopened = RunStore.open(store.run_id, root=tmp_path)
+    assert reopened.prompt == "[api] prompt"
+    assert reopened.meta == {"plan": True}
+    assert reopened.load("code") == "print(1)"
+
+    reopened.discard_from("review", CHECKPOINT_ORDER)
+    assert reopened.completed == ["code"]
+    assert reopened.load("review") is None
+    assert (reopened.dir / "review.txt.bak").exists()
+
+
+def test_open_missing_run(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunStore.open("nope", root=tmp_path)
+
+
+def test_successful_cli_run_leaves_no_run_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(cli.CrewRunner, "run", lambda self: ("print(1)", "out.py"))
+    args = ["--feature", "api", "--prompt", "p", "--output", "json", "--save", str(tmp_path / "out.py")]
+    result = CliRunner().invoke(cli.main, args)
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "out.py").read_text(encoding="utf-8") == "print(1)"
+    assert not (tmp_path / ".deepseek_runs").exists()
+
+
+def test_remove_keeps_other_runs(tmp_path):
+    root = tmp_path / ".deepseek_runs"
+    first = RunStore.create("a", root=root)
+    second = RunStore.create("b", root=root)
+    first.remove()
+    assert not first.dir.exists() and second.dir.exists()
+    second.remove()
+    assert not root.exists()
+
+
+def _runner(tmp_path, store):
+    return CrewRunner(
+        store.prompt,
+        save_path=str(tmp_path / "out.py"),
+        stats=StageStats(path=None),
+        output=JsonOutput(stream=io.StringIO()),
+        run_store=store,
+    )
+
+
+def test_resume_after_failed_tests_skips_finished_stages(tmp_path):
+    store = RunStore.create("prompt", root=tmp_path)
+    runner = _runner(tmp_path, store)
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._coder.run = lambda prompt: "VALUE = 1"
+    runner._reviewer.run = lambda code: "ok"
+    runner._fixer.run = lambda code, notes: "VALUE = 1"
+    runner._tester.run = lambda code: "from main import VALUE\n\ndef test_value():\n    assert VALUE == 2\n"
+
+    with pytest.raises(RuntimeError):
+        runner.run()
+    assert {"todo", "code", "review", "fix", "tests", "test_fix"} <= set(store.completed)
+
+    def not_again(*args):
+        raise AssertionError("finished stage executed again")
+
+    resumed = _runner(tmp_path, RunStore.open(store.run_id, root=tmp_path))
+    for agent in (resumed._todoer, resumed._coder, resumed._reviewer, resumed._tester):
+        agent.run = not_again
+    resumed._fixer.run = lambda code, notes: "VALUE = 2"
+
+    fixed_code, _ = resumed.run()
+    assert fixed_code == "VALUE = 2"
@@ -0,0 +1,102 @@
+import json
+import time
+
+from deepseek_cli.crew_runner import CrewRunner
+from deepseek_cli.tools.components import check_merged, merge_components, parse_components
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+SPEC = json.dumps({"components": [
+    {"name": "routes", "purpose": "HTTP", "interface": ["def login(email: str, password: str) -> str"], "depends_on": ["auth"]},
+    {"name": "models", "purpose": "veri", "interface": ["class User"]},
+    {"name": "auth", "purpose": "parola", "interface": ["def check(user: User, password: str) -> bool"], "depends_on": ["models"]},
+]})
+
+CODES = {
+    "models": "```python\nfrom dataclasses import dataclass\n\n@dataclass\nclass User:\n    email: str\n```",
+    "auth": "import hashlib\nfrom models import User\n\ndef check(user, password):\n    return bool(hashlib.sha256(password.encode()))\n",
+    "routes": (
+        "import hashlib\nfrom .auth import check, missing\n\ndef login(email):\n    return email\n\n"
+        "if __name__ == '__main__':\n    print(login('a'))\n"
+    ),
+}
+
+
+def test_parse_components_and_fallback():
+    components = parse_components("İşte plan:\n" + SPEC)
+    assert [c.name for c in components] == ["routes", "models", "auth"]
+    assert components[0].depends_on == ["auth"]
+    assert parse_components("tek parça yeterli") is None
+    assert parse_components(json.dumps({"components": [{"name": "all"}]})) is None
+
+
+def test_merge_orders_dedupes_and_checks_interfaces():
+    components = parse_components(SPEC)
+    merged, required = merge_components(components, CODES)
+    assert merged.count("import hashlib") == 1
+    assert "from models" not in merged and "from .auth" not in merged
+    assert merged.index("class User") < merged.index("def check") < merged.index("def login")
+    assert merged.rstrip().endswith("print(login('a'))")
+    assert required == {"User", "check", "missing"}
+
+    issues = check_merged(merged, components, sorted(required))
+    assert any("'login' imzası" in i for i in issues)
+    assert any("'missing'" in i for i in issues)
+    assert not any("'check'" in i for i in issues)
+
+
+def test_split_generates_components_in_parallel(tmp_path):
+    runner = CrewRunner("full backend", save_path=str(tmp_path / "app.py"), stats=StageStats(path=None), split=True)
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._architect.components = lambda prompt: SPEC
+    runner._reviewer.run = lambda code: "ok"
+    runner._tester.run = lambda code: "def test_dummy():\n    assert True\n"
+    seen_notes = []
+    runner._fixer.run = lambda code, notes: seen_notes.append(notes) or code
+
+    def slow_part(prompt, component, overview):
+        time.sleep(0.4)
+        return CODES[component.name]
+
+    runner._part_coder.run_component = slow_part
+    fixed_code, _ = runner.run()
+    # three 0.4 s components run side by side
+    assert runner.stats.samples("code", "latency")[0] < 1.0
+    assert "class User" in fixed_code and "def login" in fixed_code
+    assert "Bileşen birleştirme sorunları" in seen_notes[0]
+
+
+def _split_runner(tmp_path, part):
+    runner = CrewRunner("full backend", save_path=str(tmp_path / "app.py"), stats=StageStats(path=None), split=True)
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._architect.components = lambda prompt: SPEC
+    runner._reviewer.run = lambda code: "ok"
+    runner._tester.run = lambda code: "def test_dummy():\n    assert True\n"
+    runner._fixer.run = lambda code, notes: code
+    runner._coder.run = lambda prompt: "def one_shot():\n    return 1\n"
+    runner._part_coder.run_component = part
+    return runner
+
+
+def test_failed_component_is_retried_alone(tmp_path):
+    calls = []
+
+    def flaky_part(prompt, component, overview):
+        calls.append(component.name)
+        if component.name == "auth" and calls.count("auth") == 1:
+            raise RuntimeError("API çağrısı başarısız: 503")
+        return CODES[component.name]
+
+    fixed_code, _ = _split_runner(tmp_path, flaky_part).run()
+    assert sorted(calls) == ["auth", "auth", "models", "routes"]
+    assert "def check" in fixed_code and "one_shot" not in fixed_code
+
+
+def test_component_that_keeps_failing_falls_back_to_one_shot(tmp_path):
+    def broken_part(prompt, component, overview):
+        if component.name == "auth":
+            raise ValueError("unexpected response shape")
+        return CODES[component.name]
+
+    fixed_code, _ = _split_runner(tmp_path, broken_part).run()
+    assert "def one_shot" in fixed_code
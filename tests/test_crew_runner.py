@@ -1,12 +1,17 @@
+import time
+
 import pytest
 from deepseek_cli.crew_runner import CrewRunner
 import tempfile
 import os
 from unittest import mock
 
+from deepseek_cli.tools.deadline import DeadlineExceeded
+from deepseek_cli.tools.stage_stats import StageStats
+
 
 def test_generate_default_filename():
-    runner = CrewRunner("test prompt")
+    runner = CrewRunner("test prompt", stats=StageStats(path=None))
     assert runner._generate_default_filename().endswith("test_prompt.py")
 
 def test_sanitize():
@@ -14,7 +19,7 @@ def test_sanitize():
 
 def test_run(tmp_path):
     save_file = tmp_path / "test.py"
-    runner = CrewRunner("test prompt", save_path=str(save_file))
+    runner = CrewRunner("test prompt", save_path=str(save_file), stats=StageStats(path=None))
 
     # agent stubları
     runner._planner.run = lambda prompt: ""
@@ -28,4 +33,29 @@ def test_run(tmp_path):
 
     assert path == str(save_file)
     assert save_file.exists()
-    assert "print('hello')" in fixed_code 
\ No newline at end of file
+    assert "print('hello')" in fixed_code 
+
+def test_run_deadline_drops_optional_stages(tmp_path, stub_agents):
+    stats = StageStats(path=None)
+    # history says review takes far longer than the whole budget
+    for _ in range(3):
+        stats.record("review", "latency", 500.0)
+        stats.record("code", "latency", 0.1)
+        stats.record("tests", "latency", 0.1)
+    runner = CrewRunner("test prompt", save_path=str(tmp_path / "out.py"), deadline=60, stats=stats)
+    stub_agents(runner)
+
+    fixed_code, _ = runner.run()
+
+    assert runner.dropped_stages == ["review", "fix"]
+    assert "print('hello')" in fixed_code
+    assert runner._coder.request_timeout is not None
+
+
+def test_required_stage_reports_exceeded_deadline(tmp_path, stub_agents):
+    runner = CrewRunner("test prompt", save_path=str(tmp_path / "out.py"), deadline=0.2, stats=StageStats(path=None))
+    stub_agents(runner)
+    runner._coder.run = lambda prompt: time.sleep(0.5) or "print('late')"
+
+    with pytest.raises(DeadlineExceeded, match="'code'"):
+        runner.run()
@@ -0,0 +1,31 @@
+from deepseek_cli.tools.deadline import Deadline
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_estimate_uses_history():
+    stats = StageStats(path=None)
+    for value in (1.0, 2.0, 3.0):
+        stats.record("review", "latency", value)
+    deadline = Deadline(10, stats=stats, quantile=1.0)
+    assert deadline.estimate("review") == 3.0
+
+
+def test_optional_stage_keeps_room_for_required():
+    clock = FakeClock()
+    deadline = Deadline(60, stats=StageStats(path=None), clock=clock)
+    # default estimates: review 25s, tests 30s -> only 30s left for review
+    assert deadline.budget("review", ["tests"]) == 30.0
+    assert deadline.allows("review", ["tests"])
+    clock.now = 20
+    assert not deadline.allows("review", ["tests"])
+    # required stages keep whatever is left
+    clock.now = 55
+    assert deadline.budget("tests") == 5.0
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from deepseek_cli.agents import base_agent
+from deepseek_cli.tools.endpoints import Endpoint, EndpointPool
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = EndpointPool([Endpoint("https://a", "k"), Endpoint("https://b", "k")])
+    monkeypatch.setattr(base_agent, "_pool", pool)
+    return pool
+
+
+def _with_history(agent, latency):
+    agent.stats = StageStats(path=None)
+    for _ in range(5):
+        agent.stats.record("code", "latency", latency)
+    return agent
+
+
+def test_hedge_fires_and_backup_wins(pool, monkeypatch, echo_agent):
+    agent = _with_history(echo_agent, 0.5)
+    cancelled = threading.Event()
+
+    def fake_attempt(endpoint, messages, max_tokens, cancel=None, ends_at=None):
+        if endpoint.base_url == "https://a":
+            # slow primary: waits until the hedge winner cancels it
+            cancel.wait(5)
+            cancelled.set()
+            raise base_agent._AttemptCancelled(3)
+        return "from b", 2, None
+
+    monkeypatch.setattr(agent, "_attempt", fake_attempt)
+    assert agent.run("x") == "from b"
+    assert cancelled.wait(2)
+    time.sleep(0.05)
+    report = pool.report()
+    assert report["hedges_fired"] == 1
+    assert report["hedges_won"] == 1
+    assert report["extra_tokens"] > 3
+
+
+def test_failover_marks_unhealthy_endpoint(pool, monkeypatch, echo_agent):
+    agent = echo_agent
+    calls = []
+
+    def fake_attempt(endpoint, messages, max_tokens, cancel=None, ends_at=None):
+        calls.append(endpoint.base_url)
+        if endpoint.base_url == "https://a":
+            raise openai.APIConnectionError(request=None)
+        return "ok", 1, None
+
+    monkeypatch.setattr(agent, "_attempt", fake_attempt)
+    assert agent.run("x") == "ok"
+    assert agent.run("x") == "ok"
+    # second call already prefers the healthy endpoint
+    assert calls == ["https://a", "https://b", "https://b"]
+    assert pool.report()["hedges_fired"] == 0
+
+
+def test_failover_only_gets_the_remaining_budget(pool, monkeypatch, echo_agent):
+    echo_agent.request_timeout = 1.0
+    budgets = []
+
+    def fake_attempt(endpoint, messages, max_tokens, cancel=None, ends_at=None):
+        budgets.append(ends_at - time.monotonic())
+        if endpoint.base_url == "https://a":
+            time.sleep(0.3)
+            raise openai.APITimeoutError(request=None)
+        return "ok", 1, None
+
+    monkeypatch.setattr(echo_agent, "_attempt", fake_attempt)
+    assert echo_agent.run("x") == "ok"
+    assert budgets[0] > 0.9 and budgets[1] < 0.75
+
+
+def test_pooled_clients_do_not_retry():
+    endpoint = Endpoint("https://a", "k")
+    assert base_agent._client_for(endpoint).max_retries == 0
+
+
+def test_pool_cooldown_after_repeated_failures():
+    now = [0.0]
+    pool = EndpointPool([Endpoint("a", "k"), Endpoint("b", "k")], max_failures=2, cooldown=10, clock=lambda: now[0])
+    a = pool.endpoints[0]
+    pool.mark_failure(a)
+    pool.mark_failure(a)
+    assert [e.base_url for e in pool.ordered()] == ["b", "a"]
+    now[0] = 11
+    pool.mark_success(a, 0.1)
+    assert a.healthy(now[0]) and a.failures == 0
@@ -0,0 +1,83 @@
+import time
+
+from deepseek_cli.agents.reviewer_agent import REVIEW_FOCUSES
+from deepseek_cli.cli import FEATURE_REVIEWERS
+from deepseek_cli.crew_runner import CrewRunner
+from deepseek_cli.tools.findings import merge_findings, parse_findings, render_findings
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+RESULTS = {
+    "style": "Genel olarak iyi.\n- [düşük] satır 3: değişken adı `x` anlamsız\n- [orta] satır 12: SQL sorgusu string birleştirme ile kuruluyor",
+    "security": "- [yüksek] satır 12: SQL sorgusu string birleştirme ile kuruluyor, enjeksiyon riski\n- [orta] parola düz metin loglanıyor",
+    "correctness": "Sorun yok",
+}
+
+
+def test_parse_findings_reads_severity_and_line():
+    findings = parse_findings("style", RESULTS["style"])
+    assert [(f.severity, f.line) for f in findings] == [(1, 3), (2, 12)]
+    assert parse_findings("correctness", RESULTS["correctness"]) == []
+
+
+def test_merge_dedupes_and_ranks():
+    findings = merge_findings(RESULTS)
+    assert len(findings) == 3
+    top = findings[0]
+    assert top.line == 12 and top.severity == 3
+    assert top.foci == ["security", "style"]
+    assert findings[-1].line == 3
+    notes = render_findings(findings, ["security", "style"])
+    assert notes.splitlines()[1].startswith("1. [yüksek] (security, style)")
+
+
+def test_feature_reviewers_use_known_foci():
+    for foci in FEATURE_REVIEWERS.values():
+        assert set(foci) <= set(REVIEW_FOCUSES)
+
+
+def test_fan_out_review_runs_in_parallel(tmp_path):
+    runner = CrewRunner(
+        "login api",
+        save_path=str(tmp_path / "app.py"),
+        stats=StageStats(path=None),
+        reviewers=["security", "style"],
+    )
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._coder.run = lambda prompt: "print('hello')"
+    runner._reviewer.run = lambda code: (_ for _ in ()).throw(AssertionError("single reviewer used"))
+    runner._tester.run = lambda code: "def test_dummy():\n    assert True\n"
+    notes_seen = []
+    runner._fixer.run = lambda code, notes: notes_seen.append(notes) or code
+    for agent in runner._focused_reviewers:
+        agent._chat = lambda messages, focus=agent.focus: time.sleep(0.4) or RESULTS[focus]
+
+    runner.run()
+    assert runner.stats.samples("review", "latency")[0] < 0.75
+    assert "1. [yüksek] (security, style)" in notes_seen[0]
+
+
+def test_fan_out_review_survives_a_crashing_reviewer(tmp_path):
+    runner = CrewRunner(
+        "login api",
+        save_path=str(tmp_path / "app.py"),
+        stats=StageStats(path=None),
+        reviewers=["security", "style"],
+    )
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._coder.run = lambda prompt: "print('hello')"
+    runner._tester.run = lambda code: "def test_dummy():\n    assert True\n"
+    notes_seen = []
+    runner._fixer.run = lambda code, notes: notes_seen.append(notes) or code
+
+    def chat(messages, focus):
+        if focus == "style":
+            raise ValueError("unexpected response shape")
+        return RESULTS[focus]
+
+    for agent in runner._focused_reviewers:
+        agent._chat = lambda messages, focus=agent.focus: chat(messages, focus)
+
+    runner.run()
+    assert "(security)" in notes_seen[0]
+    assert "style" not in notes_seen[0].splitlines()[0]
@@ -0,0 +1,112 @@
+from deepseek_cli.crew_runner import CrewRunner
+from deepseek_cli.tools.fix_memo import FixMemo, apply_patch, make_patch, parse_failures
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+PYTEST_OUTPUT = """
+F.                                                                       [100%]
+=================================== FAILURES ===================================
+__________________________________ test_root ___________________________________
+
+    def test_root():
+>       assert root(9) == 3
+
+test_main.py:4: 
+_ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ 
+
+    def root(x):
+>       return math.sqrt(x)
+E       NameError: name 'math' is not defined
+
+main.py:2: NameError
+=========================== short test summary info ============================
+FAILED test_main.py::test_root - NameError: name 'math' is not defined
+1 failed, 1 passed in 0.02s
+"""
+
+
+def test_parse_failures_normalizes_message():
+    (failure,) = parse_failures(PYTEST_OUTPUT)
+    assert failure.exc_type == "NameError"
+    assert failure.shape == "test>main"
+    assert failure.template == "name '<p0>' is not defined"
+    assert failure.params == ["math"]
+    other = parse_failures(PYTEST_OUTPUT.replace("'math'", "'json'").replace("main.py:2", "main.py:7"))[0]
+    assert other.signature == failure.signature and other.params == ["json"]
+
+
+def test_patch_is_parameterized_by_signature_values():
+    hunks = make_patch("def root(x):\n    return math.sqrt(x)", "import math\ndef root(x):\n    return math.sqrt(x)", ["math"])
+    patched = apply_patch("def load(s):\n    return json.loads(s)", hunks, ["json"])
+    assert patched.splitlines()[0] == "import json"
+    assert make_patch("a\n", "\n".join(str(i) for i in range(50)), []) is None
+
+
+def test_params_are_abstracted_as_whole_tokens_only():
+    hunks = make_patch("def valid(id):\n    return id", "def valid(id):\n    return str(id)", ["id"])
+    assert hunks[0]["context"] == ["def valid(\x000\x00):"]
+    patched = apply_patch("def valid(key):\n    return key", hunks, ["key"])
+    assert patched == "def valid(key):\n    return str(key)"
+
+
+def test_lookup_miss_does_not_write_until_flushed(tmp_path):
+    path = tmp_path / "memo.json"
+    memo = FixMemo(path=path)
+    (failure,) = parse_failures(PYTEST_OUTPUT)
+    assert memo.lookup([failure], "x = 1") == (None, [])
+    assert not path.exists()
+    memo.save()
+    assert FixMemo(path=path).counters["lookups"] == 1
+
+
+def test_store_is_bounded_and_drops_failing_patches():
+    memo = FixMemo(path=None, max_entries=2)
+    for name in ("a", "b", "c"):
+        (failure,) = parse_failures(PYTEST_OUTPUT.replace("NameError", f"{name.upper()}Error"))
+        memo.record([failure], "x = 1", "x = 2")
+    assert len(memo) == 2
+
+    (failure,) = parse_failures(PYTEST_OUTPUT.replace("NameError", "CError"))
+    patched, applied = memo.lookup([failure], "x = 1")
+    assert patched == "x = 2"
+    memo.outcome(applied, [failure])
+    assert len(memo) == 1
+    assert memo.report()["hit_rate"] == 1.0
+
+
+def _runner(tmp_path, memo, code, fixed):
+    runner = CrewRunner(
+        "root", save_path=str(tmp_path / "out.py"), stats=StageStats(path=None), fix_memo=memo
+    )
+    runner.output.interactive = False
+    runner._todoer.run = lambda prompt: "- [ ] task"
+    runner._coder.run = lambda prompt: code
+    runner._reviewer.run = lambda code: ""
+    calls = []
+
+    def fixer(code, notes):
+        calls.append(notes)
+        # review round returns the code unchanged, the test round repairs it
+        return fixed if "NameError" in notes else code
+
+    runner._fixer.run = fixer
+    runner._tester.run = lambda code: "from main import *\n\ndef test_it():\n    assert run(9) == 3\n"
+    return runner, calls
+
+
+def test_known_failure_is_fixed_without_the_llm(tmp_path):
+    memo = FixMemo(path=None)
+    first, calls = _runner(
+        tmp_path,
+        memo,
+        "def run(x):\n    return int(math.sqrt(x))\n",
+        "import math\ndef run(x):\n    return int(math.sqrt(x))\n",
+    )
+    first.run()
+    assert len(calls) == 2 and len(memo) == 1
+
+    second, calls = _runner(tmp_path, memo, "def run(x):\n    return int(math.isqrt(x))\n", "unused")
+    fixed_code, _ = second.run()
+    assert fixed_code.startswith("import math")
+    assert len(calls) == 1  # only the review-notes round
+    assert memo.report()["fixed"] == 1
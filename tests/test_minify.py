@@ -0,0 +1,103 @@
+import ast
+
+from deepseek_cli.agents.fixer_agent import FixerAgent
+from deepseek_cli.agents.reviewer_agent import ReviewerAgent
+from deepseek_cli.tools.minify import minify
+from deepseek_cli.tools.token_budget import estimate_tokens
+
+
+SOURCE = '''"""Module docstring."""
+
+import os  # needed for paths
+
+
+class Store:
+    """Keeps items."""
+
+    def __init__(self):
+        # start empty
+        self.items = []
+
+    def add(self, item):
+        """Add an item."""
+
+
+def render(name):
+    template = """
+# not a comment
+
+{name}
+"""
+    return template.format(name=name)  # trailing
+'''
+
+
+def test_minify_strips_dead_weight_and_keeps_semantics():
+    compact, line_map = minify(SOURCE)
+    ast.parse(compact)
+    assert "docstring" not in compact and "Keeps items" not in compact
+    assert "# needed" not in compact and "# start empty" not in compact
+    # multi-line string content is untouched, empty bodies get a stub
+    assert "# not a comment\n\n{name}" in compact
+    assert "def add(self, item):\n        ..." in compact
+    assert estimate_tokens(compact) < estimate_tokens(SOURCE)
+
+    original = SOURCE.splitlines()
+    for number, line in enumerate(compact.splitlines(), 1):
+        if line.strip() and line.strip() != "...":
+            assert original[line_map.to_original(number) - 1].startswith(line)
+
+
+def test_line_references_map_both_ways():
+    compact, line_map = minify(SOURCE)
+    compact_lines = compact.splitlines()
+    ret = next(i for i, l in enumerate(compact_lines, 1) if "return template" in l)
+    orig = SOURCE.splitlines().index("    return template.format(name=name)  # trailing") + 1
+    assert line_map.refs_to_original(f"Satır {ret}: format güvenli değil") == f"Satır {orig}: format güvenli değil"
+    pytest_out = f'main.py:{orig}: in render\n  File "/tmp/test_main.py", line {orig}'
+    assert line_map.refs_to_compact(pytest_out, "main.py") == (
+        f'main.py:{ret}: in render\n  File "/tmp/test_main.py", line {orig}'
+    )
+
+
+def test_references_outside_the_code_are_left_alone():
+    compact, line_map = minify(SOURCE)
+    far = len(SOURCE.splitlines()) + 50
+    note = f"Satır 1: sorun yok. Bkz. PEP 8 line {far}, lines 2-{far}"
+    assert line_map.refs_to_original(note).endswith(f"line {far}, lines 2-{far}")
+    assert line_map.refs_to_compact(f"main.py:{far}: in f", "main.py") == f"main.py:{far}: in f"
+
+
+def test_broken_code_is_left_alone():
+    code = "def broken(:\n    # comment\n    pass\n"
+    compact, line_map = minify(code)
+    assert compact == code
+    assert line_map.to_original(2) == 2
+
+
+def test_reviewer_reports_original_lines_and_savings():
+    agent = ReviewerAgent()
+    agent.compact = True
+    sent = []
+
+    def fake_chat(messages):
+        sent.append(messages[1]["content"])
+        line = next(i for i, l in enumerate(messages[1]["content"].splitlines(), 1) if "return template" in l)
+        return f"line {line}: use f-strings"
+
+    agent._chat = fake_chat
+    review = agent.run(SOURCE)
+    assert "# trailing" not in sent[0]
+    assert review == f"line {SOURCE.splitlines().index('    return template.format(name=name)  # trailing') + 1}: use f-strings"
+    assert agent.tokens_saved > 0
+
+
+def test_fixer_always_sees_the_full_code(monkeypatch):
+    # its answer replaces the saved file, so comments and docstrings must survive
+    agent = FixerAgent()
+    agent.compact = True
+    sent = []
+    monkeypatch.setattr(agent, "_chat", lambda messages: sent.append(messages[1]["content"]) or "")
+    agent.run(SOURCE, "satır 3: kullanılmayan import")
+    assert "# needed for paths" in sent[0] and '"""Keeps items."""' in sent[0]
+    assert agent.tokens_saved == 0
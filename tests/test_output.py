@@ -0,0 +1,66 @@
+import io
+import json
+
+from rich.console import Console
+
+from deepseek_cli.crew_runner import CrewRunner
+from deepseek_cli.output import JsonOutput, ThrottledOutput
+from deepseek_cli.tools.stage_stats import StageStats
+
+
+def test_ndjson_output_streams_events(tmp_path, stub_agents):
+    stream = io.StringIO()
+    runner = CrewRunner(
+        "test prompt",
+        save_path=str(tmp_path / "out.py"),
+        stats=StageStats(path=None),
+        output=JsonOutput(stream=stream),
+    )
+    stub_agents(runner)
+    runner.run()
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    names = [e["event"] for e in events]
+    assert names[0] == "run_start"
+    assert names[-1] == "run_end"
+    assert [e["label"] for e in events if e["event"] == "stage_end"] == ["todo", "code", "review", "fix", "tests"]
+    result = next(e for e in events if e["event"] == "result")
+    assert result["tests_passed"] is True
+    assert "print('hello')" in result["code"]
+
+
+def test_json_output_writes_single_document():
+    stream = io.StringIO()
+    output = JsonOutput(stream=stream, ndjson=False)
+    output.emit("message", level="info", text="a")
+    output.emit("message", level="info", text="b")
+    assert stream.getvalue() == ""
+    output.close()
+    document = json.loads(stream.getvalue())
+    assert [e["text"] for e in document["events"]] == ["a", "b"]
+
+
+def test_throttled_output_keeps_only_tail():
+    console = Console(file=io.StringIO(), force_terminal=False)
+    output = ThrottledOutput(refresh_per_second=1, tail_lines=3, console=console)
+    output.emit("run_start")
+    output.emit("stage_start", stage="code", label="code", msg="Code")
+    output.emit("artifact", stage="code", content="\n".join(str(i) for i in range(100)))
+    output.emit("stage_end", stage="code", label="code")
+    assert list(output._state.artifact) == ["97", "98", "99"]
+    output.emit("message", level="success", text="done")
+    output.emit("run_end")
+    assert "done" in console.file.getvalue()
+
+
+def test_live_view_renders_raw_messages_and_failed_stages():
+    console = Console(file=io.StringIO(), force_terminal=False, width=200)
+    output = ThrottledOutput(refresh_per_second=1, console=console)
+    output.emit("stage_end", stage="review", label="review", ok=False)
+    output.emit("stage_end", stage="code", label="code", ok=True)
+    # exception text with brackets must not be parsed as Rich markup
+    output.emit("message", level="error", text="API çağrısı başarısız: [/bold] {'error': [1]}")
+    console.print(output._state)
+    rendered = console.file.getvalue()
+    assert "✘ review" in rendered and "✔ code" in rendered
+    assert "[/bold] {'error': [1]}" in rendered
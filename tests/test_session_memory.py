@@ -0,0 +1,57 @@
+from deepseek_cli.agents.coder_agent import CoderAgent
+from deepseek_cli.tools.session_memory import SessionMemory
+from deepseek_cli.tools.token_budget import estimate_tokens
+
+
+def _code(turn: int) -> str:
+    return "\n".join(f"def handler_{turn}_{i}(request):\n    return {i}\n" for i in range(40))
+
+
+def test_recent_turns_verbatim_and_older_summarized():
+    memory = SessionMemory(budget=6000, recent_turns=2)
+    assert memory.context() is None
+    for turn in range(1, 4):
+        memory.add(f"istek {turn}", f"def step_{turn}():\n    return {turn}\n")
+    context = memory.context()
+    assert "- Tur 1: istek 1 → step_1" in context
+    assert "def step_2():" in context and "def step_3():" in context
+    assert "def step_1():" not in context
+
+
+def test_context_stays_bounded_with_stable_prefix():
+    memory = SessionMemory(budget=2000, recent_turns=2)
+    sizes = []
+    previous = None
+    prefix_kept = 0
+    for turn in range(1, 61):
+        memory.add(f"özellik {turn}: endpoint ekle", _code(turn))
+        context = memory.context()
+        sizes.append(estimate_tokens(context))
+        if previous is not None:
+            # the summary block only grows at its end between folds
+            head = previous.split("\n### ")[0]
+            prefix_kept += context.startswith(head)
+        previous = context
+    assert max(sizes) <= 2000
+    assert len(memory._recent) == 2
+    assert prefix_kept > 40
+
+
+def test_pasted_code_in_the_request_is_cut_to_the_budget():
+    memory = SessionMemory(budget=6000, recent_turns=2)
+    pasted = "\n".join(f"def f_{i}(x):\n    return x + {i}\n" for i in range(3000))
+    memory.add("bunu düzelt:\n" + pasted, _code(1))
+    memory.add("testleri ekle", _code(2))
+    context = memory.context()
+    assert estimate_tokens(context) <= 6000
+    assert "bunu düzelt:" in context and "def handler_2_0(request):" in context
+    assert "satır kısaltıldı" in context.split("### Tur 1 isteği")[1].split("```python")[0]
+
+
+def test_agent_puts_context_before_request():
+    agent = CoderAgent()
+    agent.context = "## Oturum bağlamı\n- Tur 1: flask api"
+    messages = agent._with_context(agent.build_prompt("bunu async yap"), agent.context)
+    assert messages[0]["role"] == "system"
+    assert messages[1]["content"].startswith(agent.context)
+    assert messages[1]["content"].endswith("bunu async yap")
@@ -0,0 +1,90 @@
+import pytest
+
+from deepseek_cli.agents.fixer_agent import FixerAgent
+from deepseek_cli.agents.reviewer_agent import ReviewerAgent
+from deepseek_cli.tools import token_budget
+from deepseek_cli.tools.stage_stats import StageStats
+from deepseek_cli.tools.token_budget import PromptTooLarge, Section, TokenBudget, estimate_tokens, shrink_text
+
+
+def test_estimate_tokens_samples_large_input(monkeypatch):
+    scanned = []
+
+    class CountingPattern:
+        def findall(self, text, start=0, end=None):
+            end = len(text) if end is None else min(end, len(text))
+            scanned.append(end - start)
+            return pattern.findall(text, start, end)
+
+    pattern = token_budget._PIECE_RE
+    monkeypatch.setattr(token_budget, "_PIECE_RE", CountingPattern())
+    line = "def foo(x):\n    return x * 2  # yorum\n"
+    small, large = estimate_tokens(line * 5000), estimate_tokens(line * 500000)
+    # a 100x larger input costs the same few windows and scales the estimate
+    limit = token_budget._SAMPLE_WINDOWS * token_budget._WINDOW_SIZE
+    assert sum(scanned[:token_budget._SAMPLE_WINDOWS]) <= limit
+    assert sum(scanned[token_budget._SAMPLE_WINDOWS:]) <= limit
+    assert 95 <= large / small <= 105
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hello world") == 2
+
+
+def test_shrink_text_keeps_tail():
+    text = "\n".join(f"line {i}" for i in range(1000))
+    shrunk = shrink_text(text, 50, keep="tail")
+    assert shrunk.endswith("line 999")
+    assert "satır kısaltıldı" in shrunk
+    assert estimate_tokens(shrunk) < 80
+
+
+def test_fit_trims_lowest_priority_first():
+    budget = TokenBudget(input_limit=400, output_limit=1000)
+    code = "x = 1\n" * 20
+    notes = "FAILED test_x\n" * 500
+    fitted_code, fitted_notes = budget.fit("sys", [Section("code", code, 2), Section("notes", notes, 1, keep="tail")])
+    assert fitted_code == code
+    assert len(fitted_notes) < len(notes)
+
+
+def test_required_section_is_never_trimmed():
+    budget = TokenBudget(input_limit=300, output_limit=1000)
+    code = "value = compute(1, 2)\n" * 100
+    with pytest.raises(PromptTooLarge, match="code"):
+        budget.fit("sys", [Section("code", code, 2, required=True), Section("notes", "FAILED\n" * 50, 1)])
+
+
+def test_max_tokens_follows_history():
+    stats = StageStats(path=None)
+    budget = TokenBudget(input_limit=1000, output_limit=4096)
+    assert budget.max_tokens("code", stats) == 4096
+    for value in (400, 500, 600):
+        stats.record("code", "output_tokens", value)
+    assert budget.max_tokens("code", stats) == 900
+
+
+def test_whole_file_agents_ignore_the_history_cap(monkeypatch):
+    stats = StageStats(path=None)
+    limits = {}
+    for agent in (FixerAgent(), ReviewerAgent()):
+        for _ in range(20):
+            stats.record(agent.name, "output_tokens", 300)
+        agent.stats = stats
+
+        def request(messages, max_tokens, name=agent.name):
+            limits[name] = max_tokens
+            return "ok", 1, None
+
+        monkeypatch.setattr(agent, "_request", request)
+        agent._chat([{"role": "user", "content": "x"}])
+    # a longer file than the fixer's history must not be cut mid-answer
+    assert limits == {"fix": FixerAgent.max_output_tokens, "review": 450}
+
+
+def test_stats_are_written_once_on_save(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = StageStats(path=path)
+    stats.record("code", "latency", 1.0)
+    stats.record("code", "latency", 2.0)
+    assert not path.exists()
+    stats.save()
+    assert StageStats(path=path).samples("code", "latency") == [1.0, 2.0]
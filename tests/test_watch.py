@@ -0,0 +1,128 @@
+import io
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from deepseek_cli.agents import base_agent
+from deepseek_cli.crew_runner import CrewRunner, StageCancelled
+from deepseek_cli.output import JsonOutput
+from deepseek_cli.tools.checkpoint import RunStore
+from deepseek_cli.tools.endpoints import Endpoint
+from deepseek_cli.tools.stage_stats import StageStats
+from deepseek_cli.watch import Watcher
+
+
+def _counting_runner(store, calls, code=None, cancel=None, prompt="prompt"):
+    runner = CrewRunner(
+        prompt,
+        stats=StageStats(path=None),
+        output=JsonOutput(stream=io.StringIO()),
+        run_store=store,
+        code=code,
+        cancel=cancel,
+        plan=True,
+    )
+
+    def stub(stage, result):
+        def run(*args):
+            calls.append(stage)
+            return result
+        return run
+
+    runner._planner.run = stub("plan", "1. plan")
+    runner._todoer.run = stub("todo", "- [ ] task")
+    runner._coder.run = stub("code", "print('hello')")
+    runner._reviewer.run = stub("review", "ok")
+    runner._fixer.run = lambda code, notes: calls.append("fix") or code
+    runner._tester.run = stub("tests", "def test_dummy():\n    assert True\n")
+    return runner
+
+
+def test_code_edit_only_reruns_downstream_stages(tmp_path):
+    store = RunStore.create("prompt", root=tmp_path)
+    calls = []
+    _counting_runner(store, calls).run()
+    assert calls == ["plan", "todo", "code", "review", "fix", "tests"]
+
+    calls.clear()
+    _counting_runner(store, calls).run()
+    assert calls == []
+
+    calls.clear()
+    fixed_code, _ = _counting_runner(store, calls, code="print('edited')").run()
+    assert calls == ["review", "fix", "tests"]
+    assert fixed_code == "print('edited')"
+
+
+def test_cancel_abandons_in_flight_stage(tmp_path):
+    cancel = threading.Event()
+    runner = _counting_runner(None, [], cancel=cancel)
+    # a cooperative agent returns as soon as the run is cancelled
+    runner._planner.run = lambda prompt: cancel.wait(5) and "late"
+    threading.Timer(0.2, cancel.set).start()
+    started = time.monotonic()
+    with pytest.raises(StageCancelled):
+        runner.run()
+    assert time.monotonic() - started < 2
+
+
+def test_cancel_terminates_running_pytest(tmp_path):
+    (tmp_path / "test_slow.py").write_text("import time\n\ndef test_slow():\n    time.sleep(30)\n", encoding="utf-8")
+    cancel = threading.Event()
+    runner = _counting_runner(None, [], cancel=cancel)
+    threading.Timer(0.5, cancel.set).start()
+    started = time.monotonic()
+    with pytest.raises(StageCancelled):
+        runner._run_pytest(str(tmp_path), None)
+    assert time.monotonic() - started < 10
+
+
+def test_cancel_closes_open_api_stream(monkeypatch, echo_agent):
+    cancel = threading.Event()
+    echo_agent.cancel = cancel
+    closed = []
+
+    class Stream:
+        def __iter__(self):
+            for index in range(100):
+                if index == 2:
+                    cancel.set()
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="x"))], usage=None)
+
+        def close(self):
+            closed.append(True)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: Stream())))
+    monkeypatch.setattr(base_agent, "_client_for", lambda endpoint: client)
+    with pytest.raises(base_agent._AttemptCancelled):
+        echo_agent._attempt(Endpoint("https://a", "k"), [{"role": "user", "content": "x"}], 10)
+    assert closed == [True]
+
+
+def test_watcher_ignores_own_writes_and_picks_up_edits(tmp_path):
+    prompt_file = tmp_path / "prompt.txt"
+    save_file = tmp_path / "out.py"
+    prompt_file.write_text("make it", encoding="utf-8")
+    seen = []
+
+    class FakeRunner:
+        def __init__(self, prompt, code, cancel):
+            seen.append((prompt, code))
+
+        def run(self):
+            return "print('generated')", None
+
+    watcher = Watcher(prompt_file, save_file, FakeRunner)
+    assert watcher.prime()
+    watcher.start_run()
+    watcher.wait_idle(2)
+    assert save_file.read_text(encoding="utf-8") == "print('generated')"
+    assert watcher.poll() is False
+
+    save_file.write_text("print('hand fixed')", encoding="utf-8")
+    assert watcher.poll() is True
+    watcher.start_run()
+    watcher.wait_idle(2)
+    assert seen == [("make it", None), ("make it", "print('hand fixed')")]